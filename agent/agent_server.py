@@ -6,17 +6,62 @@ Runs on System B and exposes system metrics via XML-RPC
 
 import os
 import sys
+import glob
+import json
 import logging
 import subprocess
 import platform
 import xmlrpc.client
+from xmlrpc.server import SimpleXMLRPCServer, SimpleXMLRPCRequestHandler
+from socketserver import ThreadingMixIn
 import socket
+import struct
+import errno
+import threading
+import time
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any, Optional
 import re
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger('AgentServer')
 
+_GB = 1073741824.0  # bytes per GiB
+
+# Read size used when scanning newly appended auth log data
+_AUTH_READ_CHUNK = 1 << 20
+
+# Executables started from these world-writable locations are flagged
+SUSPICIOUS_EXE_PATHS = ('/tmp/', '/var/tmp/', '/dev/shm/')
+
+# Linux process connector constants (linux/connector.h, linux/cn_proc.h)
+_NETLINK_CONNECTOR = 11
+_CN_IDX_PROC = 1
+_CN_VAL_PROC = 1
+_PROC_CN_MCAST_LISTEN = 1
+_PROC_EVENT_EXEC = 0x00000002
+_PROC_EVENT_EXIT = 0x80000000
+_NLMSG_DONE = 3
+_NLMSG_HDR = struct.Struct('=IHHII')      # len, type, flags, seq, pid
+_CN_MSG_HDR = struct.Struct('=IIIIHH')    # idx, val, seq, ack, len, flags
+_PROC_EVENT_HDR = struct.Struct('=IIQ')   # what, cpu, timestamp_ns
+
+# Local ports commonly used by backdoors and reverse shells
+SUSPICIOUS_PORTS = frozenset({1234, 4444, 5555, 6666, 7777, 8888, 9999})
+
+# Temperature reading in `sensors` output, e.g. "Core 0:  +45.0°C"
+_TEMP_RE = re.compile(r'\+([0-9.]+)°C')
+
 # Determine default config path
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
@@ -36,6 +81,49 @@ class MonitorAgent:
         self.config = self.load_config(config_path)
         self.setup_logging()
         self.hostname = socket.gethostname()
+        self._os = platform.system().lower()
+        
+        # psutil.Process objects reused across security checks, keyed by (pid, create_time)
+        self._proc_cache: Dict[tuple, Any] = {}
+        
+        # Last psutil.net_connections() result as (monotonic timestamp, connections)
+        self._net_conn_cache = (None, [])
+        self._net_conn_ttl = self.config.get('net_connections_ttl', 30)
+        
+        # Incremental reader state for the SSH auth log
+        self._auth_state = {
+            'path': self.config.get('auth_log', '/var/log/auth.log'),
+            'inode': None,
+            'offset': 0,
+            'window': self.config.get('ssh_window_minutes', 10) * 60,
+            'events': deque()  # (monotonic timestamp, failed attempts seen)
+        }
+        
+        # Suspicious processes tracked from kernel process events when available
+        self._suspicious_live: Dict[int, str] = {}
+        self._suspicious_lock = threading.Lock()
+        self._proc_events_active = self._start_proc_events()
+        
+        # Sensor file backing CPU temperature, resolved once since it never changes after boot
+        self._temp_path = self._discover_temp_path()
+        self._read_temp = self._probe_temperature_source()
+        
+        # Prime psutil's CPU counters so later non-blocking reads return a delta
+        if psutil is not None:
+            psutil.cpu_percent(interval=None)
+        else:
+            logger.warning("psutil not installed - CPU usage will be reported as 0.0")
+        
+        # Background sampler keeps a snapshot so RPC calls never wait on collection
+        self._latest_metrics: Dict[str, Any] = {}
+        self._latest_security: Optional[Dict[str, Any]] = None
+        self._security_every_n = max(1, self.config.get('security_every_n', 10))
+        self._sample_count = 0
+        self._snap_lock = threading.Lock()
+        self._collect_lock = threading.Lock()
+        self._sampler = threading.Thread(target=self._sampler_loop, name='MetricsSampler', daemon=True)
+        self._sampler.start()
+        
         logger.info(f"Agent initialized on host: {self.hostname}")
     
     def setup_logging(self):
@@ -102,122 +190,126 @@ class MonitorAgent:
     def get_cpu_temperature(self) -> Optional[float]:
         """Get CPU temperature in Celsius"""
         try:
-            system = platform.system().lower()
-            
-            if system == "linux":
-                # Try multiple methods to get temperature
-                temp = self._get_linux_temperature()
-                if temp is not None:
-                    return temp
-                
-                # Try using vcgencmd (Raspberry Pi)
-                try:
-                    output = subprocess.check_output(['vcgencmd', 'measure_temp'], 
-                                                   universal_newlines=True)
-                    temp_str = output.strip().split('=')[1].split("'")[0]
-                    return float(temp_str)
-                except:
-                    pass
-                    
-                # Try sensors command
-                try:
-                    output = subprocess.check_output(['sensors'], 
-                                                   universal_newlines=True)
-                    # Parse sensors output for temperature
-                    for line in output.split('\n'):
-                        if 'Core' in line or 'temp' in line.lower():
-                            match = re.search(r'\+([0-9.]+)°C', line)
-                            if match:
-                                return float(match.group(1))
-                except:
-                    pass
-            
-            elif system == "darwin":  # macOS
-                try:
-                    output = subprocess.check_output(
-                        ['sysctl', '-n', 'machdep.xcpm.cpu_thermal_state'],
-                        universal_newlines=True
-                    )
-                    # macOS doesn't provide direct temperature, return None
-                    logger.info("macOS detected - temperature sensor not available via standard APIs")
-                    return None
-                except:
-                    pass
-            
-            elif system == "windows":
-                logger.info("Windows detected - temperature requires WMI or third-party tools")
-                return None
-            
-            logger.warning("Could not retrieve CPU temperature - sensor not available")
-            return None
-            
+            return self._read_temp()
         except Exception as e:
             logger.error(f"Error getting CPU temperature: {e}")
             return None
     
-    def _get_linux_temperature(self) -> Optional[float]:
-        """Get temperature on Linux systems"""
-        temp_files = [
-            '/sys/class/thermal/thermal_zone0/temp',
-            '/sys/class/thermal/thermal_zone1/temp',
-            '/sys/class/hwmon/hwmon0/temp1_input',
-            '/sys/class/hwmon/hwmon1/temp1_input'
-        ]
-        
-        for temp_file in temp_files:
+    def _probe_temperature_source(self):
+        """Pick the temperature reader that works on this host, trying each once"""
+        if self._os == "linux":
+            if self._temp_path is not None:
+                return self._get_linux_temperature
+            
+            # Raspberry Pi firmware tool, then lm-sensors
+            for reader in (self._get_vcgencmd_temperature, self._get_sensors_temperature):
+                try:
+                    if reader() is not None:
+                        return reader
+                except Exception:
+                    continue
+            logger.warning("Could not retrieve CPU temperature - sensor not available")
+        
+        elif self._os == "darwin":
+            logger.info("macOS detected - temperature sensor not available via standard APIs")
+        
+        elif self._os == "windows":
+            logger.info("Windows detected - temperature requires WMI or third-party tools")
+        
+        return lambda: None
+    
+    def _get_vcgencmd_temperature(self) -> Optional[float]:
+        """Get temperature from vcgencmd (Raspberry Pi)"""
+        output = subprocess.check_output(['vcgencmd', 'measure_temp'], 
+                                         universal_newlines=True)
+        temp_str = output.strip().split('=')[1].split("'")[0]
+        return float(temp_str)
+    
+    def _get_sensors_temperature(self) -> Optional[float]:
+        """Get temperature from lm-sensors output"""
+        output = subprocess.check_output(['sensors'], universal_newlines=True)
+        for line in output.split('\n'):
+            if 'Core' in line or 'temp' in line.lower():
+                match = _TEMP_RE.search(line)
+                if match:
+                    return float(match.group(1))
+        return None
+    
+    def _discover_temp_path(self) -> Optional[str]:
+        """Find the sysfs file that reports CPU temperature on Linux"""
+        # Prefer a hwmon device registered by a CPU temperature driver
+        for name_file in sorted(glob.glob('/sys/class/hwmon/hwmon*/name')):
             try:
-                with open(temp_file, 'r') as f:
-                    temp_millidegrees = int(f.read().strip())
-                    return temp_millidegrees / 1000.0
-            except:
+                with open(name_file, 'r') as f:
+                    name = f.read().strip()
+            except OSError:
+                continue
+            if name not in ('coretemp', 'k10temp', 'cpu_thermal'):
+                continue
+            
+            hwmon_dir = os.path.dirname(name_file)
+            inputs = sorted(glob.glob(os.path.join(hwmon_dir, 'temp*_input')))
+            # Use the package/first-core sensor when labels are available
+            for temp_input in inputs:
+                label_file = temp_input.replace('_input', '_label')
+                try:
+                    with open(label_file, 'r') as f:
+                        label = f.read().strip()
+                except OSError:
+                    continue
+                if label.startswith(('Package id 0', 'Core 0', 'Tctl', 'Tdie')):
+                    return temp_input
+            if inputs:
+                return inputs[0]
+        
+        # Fall back to thermal zones, preferring the x86 package sensor
+        zones = sorted(glob.glob('/sys/class/thermal/thermal_zone*'))
+        for zone in zones:
+            try:
+                with open(os.path.join(zone, 'type'), 'r') as f:
+                    if f.read().strip() == 'x86_pkg_temp':
+                        return os.path.join(zone, 'temp')
+            except OSError:
                 continue
+        if zones and os.path.exists(os.path.join(zones[0], 'temp')):
+            return os.path.join(zones[0], 'temp')
         
         return None
     
+    def _get_linux_temperature(self) -> Optional[float]:
+        """Get temperature on Linux systems"""
+        if self._temp_path is None:
+            return None
+        
+        try:
+            with open(self._temp_path, 'r') as f:
+                return int(f.read()) / 1000.0
+        except (OSError, ValueError):
+            return None
+    
     def get_cpu_usage(self) -> float:
-        """Get current CPU usage percentage"""
+        """Get CPU usage percentage since the previous call"""
+        if psutil is None:
+            return 0.0
         try:
-            # Use a more reliable method
-            output = subprocess.check_output(
-                ['python3', '-c', 
-                 'import psutil; print(psutil.cpu_percent(interval=1))'],
-                universal_newlines=True
-            )
-            return float(output.strip())
+            return psutil.cpu_percent(interval=None)
         except Exception as e:
             logger.error(f"Error getting CPU usage: {e}")
-            # Fallback to top
-            try:
-                output = subprocess.check_output(['top', '-bn1'], 
-                                               universal_newlines=True)
-                for line in output.split('\n'):
-                    if 'Cpu(s)' in line:
-                        match = re.search(r'([0-9.]+)%us', line)
-                        if match:
-                            return float(match.group(1))
-            except:
-                pass
             return 0.0
     
     def get_system_load(self) -> Dict[str, float]:
         """Get system load averages"""
         try:
-            load1, load5, load15 = None, None, None
-            
-            if platform.system().lower() == "windows":
+            if self._os == "windows":
                 # Windows doesn't have load average
                 return {"1min": 0.0, "5min": 0.0, "15min": 0.0}
             
-            try:
-                import psutil
-                load1, load5, load15 = psutil.getloadavg()
-            except:
-                # Fallback to uptime command
-                output = subprocess.check_output(['uptime'], universal_newlines=True)
-                parts = output.split('load average:')[1].strip().split(',')
-                load1 = float(parts[0].strip())
-                load5 = float(parts[1].strip())
-                load15 = float(parts[2].strip())
+            if self._os == "linux":
+                with open('/proc/loadavg', 'r') as f:
+                    load1, load5, load15 = map(float, f.read().split()[:3])
+            else:
+                # BSD/macOS have no /proc/loadavg but support getloadavg(3)
+                load1, load5, load15 = os.getloadavg()
             
             return {"1min": load1, "5min": load5, "15min": load15}
         except Exception as e:
@@ -227,24 +319,39 @@ class MonitorAgent:
     def get_memory_usage(self) -> Dict[str, float]:
         """Get memory usage statistics"""
         try:
-            import psutil
-            mem = psutil.virtual_memory()
+            try:
+                with open('/proc/meminfo', 'rb') as f:
+                    fields = {}
+                    for line in f:
+                        key, value = line.split(b':', 1)
+                        fields[key] = value
+                        if b'MemTotal' in fields and b'MemAvailable' in fields:
+                            break
+                # Values are reported in kB
+                total = int(fields[b'MemTotal'].split()[0]) * 1024
+                available = int(fields[b'MemAvailable'].split()[0]) * 1024
+            except (OSError, KeyError):
+                # No /proc/meminfo (Windows, macOS) or a kernel without MemAvailable
+                mem = psutil.virtual_memory()
+                total, available = mem.total, mem.available
+            
+            used = total - available
             return {
-                "total": mem.total / (1024**3),  # GB
-                "available": mem.available / (1024**3),  # GB
-                "used": mem.used / (1024**3),  # GB
-                "percent": mem.percent
+                "total": total / _GB,
+                "available": available / _GB,
+                "used": used / _GB,
+                "percent": used / total * 100
             }
         except Exception as e:
             logger.error(f"Error getting memory usage: {e}")
             return {"total": 0.0, "available": 0.0, "used": 0.0, "percent": 0.0}
     
-    def check_security_threats(self) -> Dict[str, Any]:
+    def check_security_threats(self, now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Check for potential security threats"""
         threats = {
             "status": "OK",
             "issues": [],
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso or self._now_iso()
         }
         
         try:
@@ -275,121 +382,336 @@ class MonitorAgent:
     
     def _check_suspicious_processes(self) -> list:
         """Check for suspicious processes"""
-        issues = []
+        if self._proc_events_active:
+            # Kept up to date by the process event listener
+            with self._suspicious_lock:
+                return list(self._suspicious_live.values())
+        return list(self._scan_processes().values())
+    
+    def _scan_processes(self) -> Dict[int, str]:
+        """Walk the process table and return issues keyed by PID"""
+        issues = {}
+        if psutil is None:
+            return issues
+        
         try:
-            import psutil
-            
-            # Check for processes running from suspicious locations
-            suspicious_paths = ['/tmp/', '/var/tmp/', '/dev/shm/']
-            
-            for proc in psutil.process_iter(['pid', 'name', 'exe', 'cmdline']):
+            proc_cache = {}
+            for proc in psutil.process_iter():
                 try:
-                    exe = proc.info.get('exe')
-                    if exe and any(exe.startswith(path) for path in suspicious_paths):
-                        issues.append(f"Suspicious process: {proc.info['name']} (PID: {proc.info['pid']}) from {exe}")
+                    key = (proc.pid, proc.create_time())
+                    proc = self._proc_cache.get(key, proc)
+                    proc_cache[key] = proc
                     
-                    # Check for processes with no executable path
-                    if exe is None and proc.info.get('cmdline'):
-                        issues.append(f"Process with no executable path: {proc.info['name']} (PID: {proc.info['pid']})")
+                    issue = self._process_issue(proc)
+                    if issue:
+                        issues[proc.pid] = issue
                         
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
+            
+            # Drop cached processes that have exited
+            self._proc_cache = proc_cache
                     
         except Exception as e:
             logger.error(f"Error checking processes: {e}")
         
         return issues
     
+    def _process_issue(self, proc) -> Optional[str]:
+        """Describe why a process looks suspicious, or None if it does not"""
+        # Read all attributes from /proc/<pid> in a single pass
+        with proc.oneshot():
+            info = proc.as_dict(attrs=['name', 'exe', 'cmdline'], ad_value=None)
+        
+        # Check for processes running from suspicious locations
+        exe = info['exe']
+        if exe and exe.startswith(SUSPICIOUS_EXE_PATHS):
+            return f"Suspicious process: {info['name']} (PID: {proc.pid}) from {exe}"
+        
+        # Check for processes with no executable path
+        if exe is None and info['cmdline']:
+            return f"Process with no executable path: {info['name']} (PID: {proc.pid})"
+        
+        return None
+    
+    def _start_proc_events(self) -> bool:
+        """Subscribe to kernel fork/exec/exit events through the netlink process connector
+        
+        Requires Linux and CAP_NET_ADMIN. Returns False when unavailable, in
+        which case every security check walks the process table instead.
+        """
+        if self._os != "linux" or psutil is None or not self.config.get('proc_events', True):
+            return False
+        
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, _NETLINK_CONNECTOR)
+            sock.bind((0, _CN_IDX_PROC))
+            op = struct.pack('=I', _PROC_CN_MCAST_LISTEN)
+            cn_msg = _CN_MSG_HDR.pack(_CN_IDX_PROC, _CN_VAL_PROC, 0, 0, len(op), 0) + op
+            sock.send(_NLMSG_HDR.pack(_NLMSG_HDR.size + len(cn_msg), _NLMSG_DONE, 0, 0, 0) + cn_msg)
+        except (OSError, AttributeError) as e:
+            logger.info(f"Process events unavailable ({e}) - scanning the process table on each check")
+            return False
+        
+        # Seed with processes that already exist; events cover everything after this
+        self._suspicious_live = self._scan_processes()
+        threading.Thread(target=self._proc_event_loop, args=(sock,),
+                         name='ProcEvents', daemon=True).start()
+        logger.info("Tracking suspicious processes through netlink process events")
+        return True
+    
+    def _proc_event_loop(self, sock: socket.socket):
+        """Update the live suspect set from EXEC/EXIT process events"""
+        while True:
+            try:
+                data = sock.recv(65536)
+            except OSError as e:
+                if e.errno == errno.ENOBUFS:
+                    # Events were dropped; resynchronise with a full scan
+                    suspects = self._scan_processes()
+                    with self._suspicious_lock:
+                        self._suspicious_live = suspects
+                    continue
+                logger.error(f"Process event listener stopped: {e}")
+                self._proc_events_active = False
+                sock.close()
+                return
+            
+            offset = 0
+            while offset + _NLMSG_HDR.size <= len(data):
+                msg_len = _NLMSG_HDR.unpack_from(data, offset)[0]
+                if msg_len < _NLMSG_HDR.size:
+                    break
+                event = offset + _NLMSG_HDR.size + _CN_MSG_HDR.size
+                if event + _PROC_EVENT_HDR.size + 8 <= offset + msg_len:
+                    what = _PROC_EVENT_HDR.unpack_from(data, event)[0]
+                    pid, tgid = struct.unpack_from('=II', data, event + _PROC_EVENT_HDR.size)
+                    # Only whole processes matter, not individual threads
+                    if pid == tgid and what in (_PROC_EVENT_EXEC, _PROC_EVENT_EXIT):
+                        self._handle_proc_event(what, pid)
+                offset += (msg_len + 3) & ~3
+    
+    def _handle_proc_event(self, what: int, pid: int):
+        """Re-evaluate a process after exec, forget it after exit"""
+        issue = None
+        if what == _PROC_EVENT_EXEC:
+            try:
+                issue = self._process_issue(psutil.Process(pid))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        
+        with self._suspicious_lock:
+            if issue:
+                self._suspicious_live[pid] = issue
+            else:
+                self._suspicious_live.pop(pid, None)
+    
     def _check_ssh_attempts(self) -> list:
         """Check for failed SSH login attempts"""
         issues = []
         try:
             # Check /var/log/auth.log for failed SSH attempts (Linux)
-            if platform.system().lower() == "linux":
-                try:
-                    result = subprocess.run(
-                        ['tail', '-n', '100', '/var/log/auth.log'],
-                        capture_output=True, text=True, timeout=5
-                    )
-                    failed_count = 0
-                    for line in result.stdout.split('\n'):
-                        if 'Failed password' in line:
-                            failed_count += 1
-                    
-                    if failed_count > 10:  # Threshold for suspicious activity
-                        issues.append(f"High number of failed SSH attempts: {failed_count} in recent logs")
-                except:
-                    pass
+            if self._os == "linux":
+                state = self._auth_state
+                now = time.monotonic()
+                
+                new_failures = self._read_new_ssh_failures()
+                if new_failures:
+                    state['events'].append((now, new_failures))
+                
+                # Only failures inside the rolling window count towards the threshold
+                events = state['events']
+                while events and now - events[0][0] > state['window']:
+                    events.popleft()
+                failed_count = sum(count for _, count in events)
+                
+                if failed_count > 10:  # Threshold for suspicious activity
+                    minutes = state['window'] // 60
+                    issues.append(f"High number of failed SSH attempts: {failed_count} in the last {minutes} minutes")
         except Exception as e:
             logger.error(f"Error checking SSH attempts: {e}")
         
         return issues
     
+    def _read_new_ssh_failures(self) -> int:
+        """Count failed password attempts logged since the previous check"""
+        state = self._auth_state
+        try:
+            st = os.stat(state['path'])
+        except FileNotFoundError:
+            return self._read_journal_ssh_failures()
+        
+        if st.st_ino != state['inode']:
+            # First check: start near the end so only a recent tail is counted
+            state['offset'] = max(0, st.st_size - 16384) if state['inode'] is None else 0
+            state['inode'] = st.st_ino
+        elif st.st_size < state['offset']:
+            # Truncated in place
+            state['offset'] = 0
+        
+        if st.st_size == state['offset']:
+            return 0
+        
+        # Scan appended bytes in bounded chunks, carrying a short tail so a
+        # marker split across two reads is still counted exactly once
+        pattern = b'Failed password'
+        failed = 0
+        carry = b''
+        with open(state['path'], 'rb') as f:
+            f.seek(state['offset'])
+            while True:
+                chunk = f.read(_AUTH_READ_CHUNK)
+                if not chunk:
+                    break
+                buf = carry + chunk
+                failed += buf.count(pattern)
+                carry = buf[-(len(pattern) - 1):]
+            state['offset'] = f.tell()
+        return failed
+    
+    def _read_journal_ssh_failures(self) -> int:
+        """Count failed password attempts from journald on systems without auth.log"""
+        state = self._auth_state
+        now = time.time()
+        since = state.get('journal_since', now - state['window'])
+        try:
+            result = subprocess.run(
+                ['journalctl', '-q', '--no-pager', '_COMM=sshd',
+                 f"--since=@{since:.0f}", f"--until=@{now:.0f}"],
+                capture_output=True, timeout=5
+            )
+        except (OSError, subprocess.SubprocessError):
+            return 0
+        state['journal_since'] = now
+        return result.stdout.count(b'Failed password')
+    
     def _check_network_activity(self) -> list:
         """Check for unusual network activity"""
         issues = []
+        if psutil is None:
+            return issues
+        
         try:
-            import psutil
+            connections = self._get_net_connections()
             
-            connections = psutil.net_connections(kind='inet')
-            listening_ports = len([c for c in connections if c.status == 'LISTEN'])
+            # Count listeners and check established connections in a single pass
+            listening_ports = 0
+            port_issues = []
+            for conn in connections:
+                if conn.status == 'LISTEN':
+                    listening_ports += 1
+                elif conn.status == 'ESTABLISHED' and conn.laddr and conn.laddr.port in SUSPICIOUS_PORTS:
+                    port_issues.append(f"Connection on suspicious port: {conn.laddr.port}")
             
             # Alert if too many listening ports (potential backdoor)
             if listening_ports > 100:
                 issues.append(f"Unusually high number of listening ports: {listening_ports}")
-            
-            # Check for established connections to suspicious ports
-            suspicious_ports = [1234, 4444, 5555, 6666, 7777, 8888, 9999]
-            established_conns = [c for c in connections if c.status == 'ESTABLISHED']
-            
-            for conn in established_conns:
-                if conn.laddr and conn.laddr.port in suspicious_ports:
-                    issues.append(f"Connection on suspicious port: {conn.laddr.port}")
+            issues.extend(port_issues)
                     
         except Exception as e:
             logger.error(f"Error checking network activity: {e}")
         
         return issues
     
+    def _get_net_connections(self) -> list:
+        """Get TCP connections, reusing the previous result within the cache TTL"""
+        cached_at, connections = self._net_conn_cache
+        now = time.monotonic()
+        if cached_at is not None and now - cached_at < self._net_conn_ttl:
+            return connections
+        
+        # Only TCP sockets have LISTEN/ESTABLISHED states, so skip UDP entirely
+        connections = psutil.net_connections(kind='tcp')
+        self._net_conn_cache = (now, connections)
+        return connections
+    
     def get_disk_usage(self) -> Dict[str, float]:
         """Get disk usage statistics"""
         try:
-            import psutil
-            disk = psutil.disk_usage('/')
+            if hasattr(os, 'statvfs'):
+                st = os.statvfs('/')
+                total = st.f_frsize * st.f_blocks
+                used = st.f_frsize * (st.f_blocks - st.f_bfree)
+                free = st.f_frsize * st.f_bavail
+            else:
+                disk = psutil.disk_usage('/')
+                total, used, free = disk.total, disk.used, disk.free
+            
             return {
-                "total": disk.total / (1024**3),  # GB
-                "used": disk.used / (1024**3),  # GB
-                "free": disk.free / (1024**3),  # GB
-                "percent": (disk.used / disk.total) * 100
+                "total": total / _GB,
+                "used": used / _GB,
+                "free": free / _GB,
+                "percent": (used / total) * 100
             }
         except Exception as e:
             logger.error(f"Error getting disk usage: {e}")
             return {"total": 0.0, "used": 0.0, "free": 0.0, "percent": 0.0}
     
-    def get_all_metrics(self) -> Dict[str, Any]:
-        """Get all system metrics"""
+    def _now_iso(self) -> str:
+        """Current local time as an ISO 8601 string"""
+        return datetime.now().isoformat()
+    
+    def get_all_metrics(self, security_threats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get all system metrics, reusing security_threats when one is passed in"""
+        # One timestamp for the whole sample so every field lines up
+        now_iso = self._now_iso()
         metrics = {
             "hostname": self.hostname,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso,
             "cpu_temperature": self.get_cpu_temperature(),
             "cpu_usage": self.get_cpu_usage(),
             "system_load": self.get_system_load(),
             "memory_usage": self.get_memory_usage(),
             "disk_usage": self.get_disk_usage(),
-            "security_threats": self.check_security_threats()
+            "security_threats": security_threats or self.check_security_threats(now_iso=now_iso)
         }
         
         logger.info(f"Collected metrics for {self.hostname}")
         return metrics
     
+    def _sample(self, force_security: bool = False) -> Dict[str, Any]:
+        """Collect a new sample and publish it as the latest snapshot
+        
+        The security checks are far more expensive than the other metrics, so
+        they only run on every security_every_n-th sample; in between the
+        previous result is carried over.
+        """
+        with self._collect_lock:
+            refresh = (force_security or self._latest_security is None
+                       or self._sample_count % self._security_every_n == 0)
+            self._sample_count += 1
+            metrics = self.get_all_metrics(None if refresh else self._latest_security)
+            self._latest_security = metrics["security_threats"]
+        with self._snap_lock:
+            self._latest_metrics = metrics
+        return metrics
+    
+    def _sampler_loop(self):
+        """Refresh the metrics snapshot every check_interval seconds"""
+        interval = self.config.get('check_interval', 30)
+        while True:
+            try:
+                self._sample()
+            except Exception as e:
+                logger.error(f"Error in metrics sampler: {e}")
+            time.sleep(interval)
+    
     # XML-RPC methods
     def ping(self) -> str:
         """Simple ping method for connectivity test"""
         return f"PONG from {self.hostname}"
     
     def get_metrics(self) -> Dict[str, Any]:
-        """Get all system metrics"""
-        return self.get_all_metrics()
+        """Get the latest sampled system metrics"""
+        with self._snap_lock:
+            if self._latest_metrics:
+                return dict(self._latest_metrics)
+        # No sample published yet
+        return self._sample()
+    
+    def get_metrics_fresh(self) -> Dict[str, Any]:
+        """Collect and return system metrics right now"""
+        return self._sample(force_security=True)
     
     def get_temperature(self) -> Optional[float]:
         """Get only CPU temperature"""
@@ -403,15 +725,123 @@ class MonitorAgent:
         }
     
     def get_security_status(self) -> Dict[str, Any]:
-        """Get security status"""
-        return self.check_security_threats()
+        """Get security status, running the checks right now"""
+        with self._collect_lock:
+            self._latest_security = self.check_security_threats()
+            return self._latest_security
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class ThreadedXMLRPCServer(ThreadingMixIn, SimpleXMLRPCServer):
+    """XML-RPC server that handles each connection in its own thread
+    
+    At most max_connections connections are served at once; further ones
+    are answered 503 and closed instead of getting a thread.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, *args, max_connections: int = 16, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._slots = threading.BoundedSemaphore(max_connections)
+    
+    def process_request(self, request, client_address):
+        """Start a handler thread if a slot is free, else reject the connection"""
+        if not self._slots.acquire(blocking=False):
+            self._reject(request)
+            return
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._slots.release()
+    
+    def _reject(self, request):
+        """Answer 503 on a connection that arrived while every slot was busy"""
+        try:
+            request.sendall(b"HTTP/1.1 503 Service Unavailable\r\n"
+                            b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+
+class AgentRequestHandler(SimpleXMLRPCRequestHandler):
+    """XML-RPC request handler that also answers JSON-RPC 2.0 calls
+    
+    Requests with Content-Type application/json are dispatched to the same
+    agent methods and answered with a (gzip-compressed when accepted) JSON
+    body; everything else falls through to the regular XML-RPC handling.
+    """
+    
+    # Keep collector connections open between polls; idle ones are dropped
+    # soon after, since each open connection holds one of the server's slots
+    protocol_version = 'HTTP/1.1'
+    timeout = 15
+    
+    def do_POST(self):
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip()
+        if content_type != 'application/json':
+            return super().do_POST()
+        
+        if not self.is_rpc_path_valid():
+            self.report_404()
+            return
+        
+        try:
+            length = int(self.headers['content-length'])
+            request = _json_loads(self.rfile.read(length))
+            request_id = request.get('id')
+            try:
+                result = self.server._dispatch(request['method'], request.get('params', []))
+                response = {'jsonrpc': '2.0', 'result': result, 'id': request_id}
+            except Exception as e:
+                response = {
+                    'jsonrpc': '2.0',
+                    'error': {'code': -32000, 'message': f"{type(e).__name__}: {e}"},
+                    'id': request_id
+                }
+            body = _json_dumps(response)
+        except Exception as e:
+            logger.error(f"Error handling JSON-RPC request: {e}")
+            self.send_response(500)
+            self.send_header("Content-length", "0")
+            self.end_headers()
+            return
+        
+        self.send_response(200)
+        self.send_header("Content-type", "application/json")
+        if self.encode_threshold is not None and len(body) > self.encode_threshold:
+            if self.accept_encodings().get("gzip", 0):
+                body = xmlrpc.client.gzip_encode(body)
+                self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
 
 def main():
     """Main entry point for the agent server"""
-    from xmlrpc.server import SimpleXMLRPCServer
     import signal
-    import json
     
     # Load configuration
     agent = MonitorAgent()
@@ -421,7 +851,8 @@ def main():
     port = agent.config.get("port", 8000)
     
     # Create server
-    server = SimpleXMLRPCServer((host, port), allow_none=True)
+    server = ThreadedXMLRPCServer((host, port), requestHandler=AgentRequestHandler, allow_none=True,
+                                  max_connections=agent.config.get("max_connections", 16))
     server.register_instance(agent)
     
     logger.info(f"Starting XML-RPC Agent Server on {host}:{port}")
@@ -7,7 +7,9 @@ Runs on System A and collects metrics from multiple System B agents
 import sys
 import json
 import time
+import socket
 import logging
+import http.client
 import xmlrpc.client
 from datetime import datetime
 from typing import Dict, List, Any
@@ -19,6 +21,119 @@ import signal
 sys.path.append('/home/engine/project/storage')
 from storage_factory import StorageFactory
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class KeepAliveHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection with TCP keep-alive probes enabled on its socket"""
+    
+    def connect(self):
+        super().connect()
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+
+class KeepAliveTransport(xmlrpc.client.Transport):
+    """XML-RPC transport that holds one persistent, timeout-bounded connection"""
+    
+    def __init__(self, timeout: float, *args, **kwargs):
+        kwargs.setdefault('headers', [('Connection', 'keep-alive')])
+        super().__init__(*args, **kwargs)
+        self.timeout = timeout
+    
+    def make_connection(self, host):
+        if self._connection and host == self._connection[0]:
+            return self._connection[1]
+        chost, self._extra_headers, _ = self.get_host_info(host)
+        self._connection = host, KeepAliveHTTPConnection(chost, timeout=self.timeout)
+        return self._connection[1]
+
+
+class JSONRPCProxy:
+    """Minimal JSON-RPC 2.0 client exposing agent methods like a ServerProxy
+    
+    Talks to the agent's JSON-RPC handler over one persistent, gzip-capable
+    HTTP connection. Errors are raised as xmlrpc.client.Fault/ProtocolError so
+    callers handle both protocols the same way.
+    """
+    
+    def __init__(self, host: str, port: int, timeout: float, path: str = '/RPC2'):
+        self._address = f"{host}:{port}"
+        self._path = path
+        self._timeout = timeout
+        self._connection = None
+        self._request_id = 0
+    
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return lambda *params: self._call(name, params)
+    
+    def _call(self, method: str, params: tuple) -> Any:
+        self._request_id += 1
+        body = _json_dumps({
+            'jsonrpc': '2.0', 'method': method, 'params': list(params), 'id': self._request_id
+        })
+        headers = {
+            'Content-Type': 'application/json',
+            'Accept-Encoding': 'gzip',
+            'Connection': 'keep-alive'
+        }
+        
+        # Retry once if a reused connection was closed by the agent in the meantime
+        for attempt in (0, 1):
+            reused = self._connection is not None
+            if not reused:
+                self._connection = KeepAliveHTTPConnection(self._address, timeout=self._timeout)
+            try:
+                self._connection.request('POST', self._path, body, headers)
+                response = self._connection.getresponse()
+                data = response.read()
+                break
+            except (ConnectionError, http.client.HTTPException):
+                self._close()
+                if attempt or not reused:
+                    raise
+            except Exception:
+                self._close()
+                raise
+        
+        if response.will_close:
+            self._close()
+        if response.status != 200:
+            raise xmlrpc.client.ProtocolError(
+                self._address + self._path, response.status, response.reason, dict(response.getheaders())
+            )
+        if response.getheader('Content-Encoding', '') == 'gzip':
+            data = xmlrpc.client.gzip_decode(data)
+        
+        reply = _json_loads(data)
+        if 'error' in reply:
+            error = reply['error']
+            raise xmlrpc.client.Fault(error.get('code', -32000), error.get('message', ''))
+        return reply.get('result')
+    
+    def _close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class MetricCollector:
     """Collector that polls multiple agents and stores metrics"""
@@ -30,6 +145,16 @@ class MetricCollector:
         self.running = False
         self.storage = StorageFactory.create_storage(self.config.get('storage', {}))
         
+        # Worker pool reused for every collection cycle
+        max_workers = min(max(1, len(self.agents)), self.config.get('max_workers', 32))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='collector')
+        
+        # Threshold checks resolved once from the configuration
+        self._threshold_specs = self._build_threshold_specs()
+        
+        # One proxy per agent, reused across cycles so its HTTP connection stays open
+        self._proxies: Dict[str, Any] = {}
+        
         # Setup logging
         self.setup_logging()
         self.logger = logging.getLogger('MetricCollector')
@@ -53,6 +178,8 @@ class MetricCollector:
             ],
             "poll_interval": 30,
             "timeout": 10,
+            "max_workers": 32,
+            "protocol": "xmlrpc",
             "storage": {
                 "type": "file",
                 "log_file": "/var/log/metrics_collector.log",
@@ -84,31 +211,39 @@ class MetricCollector:
             ]
         )
     
-    def create_agent_proxy(self, agent_config: Dict[str, Any]) -> xmlrpc.client.ServerProxy:
-        """Create XML-RPC proxy for an agent"""
-        host = agent_config.get('host', 'localhost')
-        port = agent_config.get('port', 8000)
-        url = f"http://{host}:{port}"
-        return xmlrpc.client.ServerProxy(url, allow_none=True)
+    def create_agent_proxy(self, agent_config: Dict[str, Any]):
+        """Get the cached RPC proxy for an agent, creating it on first use"""
+        agent_name = agent_config.get('name', agent_config.get('host'))
+        proxy = self._proxies.get(agent_name)
+        if proxy is None:
+            host = agent_config.get('host', 'localhost')
+            port = agent_config.get('port', 8000)
+            timeout = self.config.get('timeout', 10)
+            protocol = agent_config.get('protocol', self.config.get('protocol', 'xmlrpc'))
+            if protocol == 'jsonrpc':
+                proxy = JSONRPCProxy(host, port, timeout)
+            else:
+                url = f"http://{host}:{port}"
+                transport = KeepAliveTransport(timeout)
+                proxy = xmlrpc.client.ServerProxy(url, transport=transport, allow_none=True)
+            self._proxies[agent_name] = proxy
+        return proxy
     
     def collect_from_agent(self, agent_config: Dict[str, Any]) -> Dict[str, Any]:
         """Collect metrics from a single agent"""
         agent_name = agent_config.get('name', agent_config.get('host'))
         timeout = self.config.get('timeout', 10)
+        collection_time = datetime.now().isoformat()
         
         try:
             proxy = self.create_agent_proxy(agent_config)
             
-            # Test connection
-            result = proxy.ping()
-            self.logger.debug(f"Ping successful for {agent_name}: {result}")
-            
-            # Get metrics
+            # A failed call already signals an unreachable agent, so no separate ping
             metrics = proxy.get_metrics()
             
             # Add metadata
             metrics['agent_name'] = agent_name
-            metrics['collection_time'] = datetime.now().isoformat()
+            metrics['collection_time'] = collection_time
             metrics['status'] = 'success'
             
             # Check thresholds
@@ -124,7 +259,7 @@ class MetricCollector:
                 'agent_name': agent_name,
                 'status': 'error',
                 'error': error_msg,
-                'collection_time': datetime.now().isoformat()
+                'collection_time': collection_time
             }
         except Exception as e:
             error_msg = f"Error collecting from {agent_name}: {str(e)}"
@@ -133,67 +268,48 @@ class MetricCollector:
                 'agent_name': agent_name,
                 'status': 'error',
                 'error': error_msg,
-                'collection_time': datetime.now().isoformat()
+                'collection_time': collection_time
             }
     
+    def _build_threshold_specs(self) -> List[tuple]:
+        """Precompute (type, severity, threshold, accessor, message) for configured thresholds"""
+        thresholds = self.config.get('thresholds', {})
+        candidates = [
+            ('cpu_usage', 'CPU_USAGE', 'HIGH',
+             lambda m: m.get('cpu_usage'),
+             "CPU usage ({value:.1f}%) exceeds threshold ({threshold}%)"),
+            ('cpu_temperature', 'CPU_TEMPERATURE', 'HIGH',
+             lambda m: m.get('cpu_temperature'),
+             "CPU temperature ({value:.1f}°C) exceeds threshold ({threshold}°C)"),
+            ('system_load', 'SYSTEM_LOAD', 'MEDIUM',
+             lambda m: (m.get('system_load') or {}).get('1min'),
+             "System load ({value:.2f}) exceeds threshold ({threshold})"),
+            ('memory_usage', 'MEMORY_USAGE', 'MEDIUM',
+             lambda m: (m.get('memory_usage') or {}).get('percent'),
+             "Memory usage ({value:.1f}%) exceeds threshold ({threshold}%)"),
+            ('disk_usage', 'DISK_USAGE', 'HIGH',
+             lambda m: (m.get('disk_usage') or {}).get('percent'),
+             "Disk usage ({value:.1f}%) exceeds threshold ({threshold}%)"),
+        ]
+        return [
+            (alert_type, severity, thresholds[key], accessor, message)
+            for key, alert_type, severity, accessor, message in candidates
+            if key in thresholds
+        ]
+    
     def check_thresholds(self, metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Check metrics against thresholds and generate alerts"""
         alerts = []
-        thresholds = self.config.get('thresholds', {})
-        
-        # Check CPU usage
-        if 'cpu_usage' in metrics and 'cpu_usage' in thresholds:
-            if metrics['cpu_usage'] > thresholds['cpu_usage']:
-                alerts.append({
-                    'type': 'CPU_USAGE',
-                    'severity': 'HIGH',
-                    'value': metrics['cpu_usage'],
-                    'threshold': thresholds['cpu_usage'],
-                    'message': f"CPU usage ({metrics['cpu_usage']:.1f}%) exceeds threshold ({thresholds['cpu_usage']}%)"
-                })
         
-        # Check CPU temperature
-        if metrics.get('cpu_temperature') and 'cpu_temperature' in thresholds:
-            if metrics['cpu_temperature'] > thresholds['cpu_temperature']:
+        for alert_type, severity, threshold, accessor, message in self._threshold_specs:
+            value = accessor(metrics)
+            if value is not None and value > threshold:
                 alerts.append({
-                    'type': 'CPU_TEMPERATURE',
-                    'severity': 'HIGH',
-                    'value': metrics['cpu_temperature'],
-                    'threshold': thresholds['cpu_temperature'],
-                    'message': f"CPU temperature ({metrics['cpu_temperature']:.1f}°C) exceeds threshold ({thresholds['cpu_temperature']}°C)"
-                })
-        
-        # Check system load
-        if 'system_load' in metrics and 'system_load' in thresholds:
-            if metrics['system_load']['1min'] > thresholds['system_load']:
-                alerts.append({
-                    'type': 'SYSTEM_LOAD',
-                    'severity': 'MEDIUM',
-                    'value': metrics['system_load']['1min'],
-                    'threshold': thresholds['system_load'],
-                    'message': f"System load ({metrics['system_load']['1min']:.2f}) exceeds threshold ({thresholds['system_load']})"
-                })
-        
-        # Check memory usage
-        if 'memory_usage' in metrics and 'memory_usage' in thresholds:
-            if metrics['memory_usage']['percent'] > thresholds['memory_usage']:
-                alerts.append({
-                    'type': 'MEMORY_USAGE',
-                    'severity': 'MEDIUM',
-                    'value': metrics['memory_usage']['percent'],
-                    'threshold': thresholds['memory_usage'],
-                    'message': f"Memory usage ({metrics['memory_usage']['percent']:.1f}%) exceeds threshold ({thresholds['memory_usage']}%)"
-                })
-        
-        # Check disk usage
-        if 'disk_usage' in metrics and 'disk_usage' in thresholds:
-            if metrics['disk_usage']['percent'] > thresholds['disk_usage']:
-                alerts.append({
-                    'type': 'DISK_USAGE',
-                    'severity': 'HIGH',
-                    'value': metrics['disk_usage']['percent'],
-                    'threshold': thresholds['disk_usage'],
-                    'message': f"Disk usage ({metrics['disk_usage']['percent']:.1f}%) exceeds threshold ({thresholds['disk_usage']}%)"
+                    'type': alert_type,
+                    'severity': severity,
+                    'value': value,
+                    'threshold': threshold,
+                    'message': message.format(value=value, threshold=threshold)
                 })
         
         # Check security threats
@@ -214,21 +330,20 @@ class MetricCollector:
             return []
         
         results = []
-        max_workers = min(len(self.agents), 10)  # Limit concurrent connections
+        # Each RPC is bounded by the transport timeout, so a slow agent only
+        # occupies its own worker instead of delaying the rest of the cycle
+        future_to_agent = {
+            self._executor.submit(self.collect_from_agent, agent): agent 
+            for agent in self.agents
+        }
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_agent = {
-                executor.submit(self.collect_from_agent, agent): agent 
-                for agent in self.agents
-            }
-            
-            for future in as_completed(future_to_agent):
-                try:
-                    result = future.result(timeout=self.config.get('timeout', 10))
-                    results.append(result)
-                except Exception as e:
-                    agent = future_to_agent[future]
-                    self.logger.error(f"Error in future for {agent.get('name', 'unknown')}: {e}")
+        for future in as_completed(future_to_agent):
+            try:
+                result = future.result()
+                results.append(result)
+            except Exception as e:
+                agent = future_to_agent[future]
+                self.logger.error(f"Error in future for {agent.get('name', 'unknown')}: {e}")
         
         return results
     
@@ -288,6 +403,7 @@ class MetricCollector:
         """Stop the collection loop"""
         self.logger.info("Stopping collection...")
         self.running = False
+        self._executor.shutdown(wait=False)
 
 
 def main():
@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration for the monitoring dashboard
+
+Usage: gunicorn -c config/gunicorn.conf.py dashboard:app
+"""
+
+import os
+
+bind = f"{os.environ.get('DASHBOARD_HOST', '0.0.0.0')}:{os.environ.get('DASHBOARD_PORT', '5000')}"
+
+# Device list, metrics cache and agent connections live in process memory,
+# so run a single worker and scale with threads; agent fan-out already runs
+# on the dashboard's own thread pool.
+workers = 1
+worker_class = 'gthread'
+threads = int(os.environ.get('DASHBOARD_THREADS', '32'))
+timeout = int(os.environ.get('AGENT_TIMEOUT', '10')) * 3
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_worker_init(worker):
+    """Warm the dashboard inside the worker, after fork"""
+    import dashboard
+    dashboard.startup()
@@ -6,12 +6,36 @@ Provides auto-refreshing UI, device management, and live metrics/graphs
 
 import os
 import json
+import asyncio
+import atexit
+import time
 import logging
+import socket
+import sqlite3
+import http.client
 import xmlrpc.client
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-from flask import Flask, render_template, request, jsonify
-from threading import Lock
+from typing import Dict, List, Any, Optional, Tuple
+from flask import Flask, Response, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+from threading import Condition, Event, Lock, Thread
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 # Setup logging
 logging.basicConfig(
@@ -22,108 +46,283 @@ logger = logging.getLogger('Dashboard')
 
 app = Flask(__name__)
 
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC)
+    return json.dumps(obj, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+if orjson is not None:
+    try:
+        from flask_orjson import OrjsonProvider
+    except ImportError:
+        class OrjsonProvider(DefaultJSONProvider):
+            """Flask JSON provider backed by orjson"""
+
+            def dumps(self, obj: Any, **kwargs: Any) -> str:
+                option = orjson.OPT_NON_STR_KEYS
+                if self.sort_keys:
+                    option |= orjson.OPT_SORT_KEYS
+                return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+            def loads(self, s: Any, **kwargs: Any) -> Any:
+                return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+
 # Configuration - use environment variables or defaults
 PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
 DEVICES_FILE = os.environ.get('DEVICES_FILE', os.path.join(PROJECT_DIR, 'config', 'dashboard_devices.json'))
-METRICS_FILE = os.environ.get('METRICS_FILE', os.path.join(PROJECT_DIR, 'storage', 'latest_metrics.json'))
+DEVICES_DB = os.environ.get('DEVICES_DB', os.path.splitext(DEVICES_FILE)[0] + '.db')  # DEVICES_FILE is imported once
+METRICS_FILE = os.environ.get('METRICS_FILE', os.path.join(
+    PROJECT_DIR, 'storage', 'latest_metrics.msgpack' if msgpack is not None else 'latest_metrics.json'))
 POLL_INTERVAL = int(os.environ.get('POLL_INTERVAL', '5'))  # seconds
 AGENT_TIMEOUT = int(os.environ.get('AGENT_TIMEOUT', '10'))  # seconds
+CONNECT_TIMEOUT = float(os.environ.get('CONNECT_TIMEOUT', '1'))  # seconds, TCP connect only
+MAX_WORKERS = int(os.environ.get('MAX_WORKERS', '32'))  # parallel device collections
+ASYNC_COLLECT = os.environ.get('ASYNC_COLLECT', 'false').lower() == 'true'  # needs httpx
 
 # Ensure directories exist
-os.makedirs(os.path.dirname(DEVICES_FILE), exist_ok=True)
+os.makedirs(os.path.dirname(DEVICES_DB), exist_ok=True)
 os.makedirs(os.path.dirname(METRICS_FILE), exist_ok=True)
 
-# Thread-safe device storage
-devices_lock = Lock()
-devices: List[Dict[str, Any]] = []
-metrics_cache: Dict[str, Any] = {}
-metrics_cache_lock = Lock()
+# Device and metrics state is published as immutable snapshots: writers
+# build a new object and swap the reference, readers never take a lock.
+devices_lock = Lock()  # serializes writers only
+metrics_cache_ref: List[Dict[str, Any]] = [{}]
 
 
-class DeviceManager:
-    """Manages monitored devices configuration"""
+class KeepAliveHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection with TCP keep-alive probes enabled on its socket
+
+    The TCP connect is bounded by CONNECT_TIMEOUT so a dead host fails fast,
+    while requests on an established connection get the full timeout.
+    """
+
+    def connect(self):
+        timeout = self.timeout
+        self.timeout = min(CONNECT_TIMEOUT, timeout)
+        try:
+            super().connect()
+        finally:
+            self.timeout = timeout
+        self.sock.settimeout(timeout)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+
+class KeepAliveTransport(xmlrpc.client.Transport):
+    """XML-RPC transport that holds one persistent, timeout-bounded connection"""
+
+    def __init__(self, timeout: float, *args, **kwargs):
+        kwargs.setdefault('headers', [('Connection', 'keep-alive')])
+        super().__init__(*args, **kwargs)
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        if self._connection and host == self._connection[0]:
+            return self._connection[1]
+        chost, self._extra_headers, _ = self.get_host_info(host)
+        self._connection = host, KeepAliveHTTPConnection(chost, timeout=self.timeout)
+        return self._connection[1]
+
+
+# (epoch second, ISO string) for iso_now
+_ts_cache: List[Tuple[int, str]] = [(0, '')]
+
+
+def iso_now() -> str:
+    """Current local time as an ISO string, formatted at most once per second"""
+    second = int(time.time())
+    cached_second, text = _ts_cache[0]
+    if cached_second != second:
+        text = datetime.fromtimestamp(second).isoformat()
+        _ts_cache[0] = (second, text)
+    return text
+
 
-    def __init__(self, devices_file: str):
-        self.devices_file = devices_file
-        self.devices = []
+def _atomic_write(path: str, data: bytes):
+    """Durably replace a file: write a temp file, fsync it, then rename over"""
+    temp_file = path + '.tmp'
+    fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(temp_file, path)
+
+
+def _metrics_file_is_msgpack() -> bool:
+    """Metrics persistence format follows the METRICS_FILE extension"""
+    return msgpack is not None and METRICS_FILE.endswith('.msgpack')
+
+
+class DeviceManager:
+    """Manages monitored devices configuration
+
+    Devices persist in a SQLite table (WAL mode), so each mutation writes a
+    single row. Reads are served from an in-memory snapshot.
+    """
+
+    def __init__(self, db_path: str, import_file: Optional[str] = None):
+        self.db_path = db_path
+        self.import_file = import_file
+        self._devices: Tuple[Dict[str, Any], ...] = ()
+        # Serialized /api/devices body, refreshed whenever the snapshot changes
+        self._devices_json_bytes = b''
+        # Lookup indices, maintained by writers alongside the snapshot
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._by_hostport: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._db = self._init_db()
         self.load_devices()
 
+    def _init_db(self) -> sqlite3.Connection:
+        """Open the devices database and create the schema"""
+        db = sqlite3.connect(self.db_path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        with db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS devices (
+                    name TEXT PRIMARY KEY,
+                    host TEXT NOT NULL,
+                    port INTEGER NOT NULL,
+                    added_at TEXT NOT NULL,
+                    enabled INTEGER NOT NULL DEFAULT 1,
+                    UNIQUE (host, port)
+                )
+            """)
+        return db
+
+    def _import_json(self):
+        """One-time import of a legacy JSON device list into an empty table"""
+        if not self.import_file or not os.path.exists(self.import_file):
+            return
+        with open(self.import_file, 'rb') as f:
+            devices = _json_loads(f.read())
+        with self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO devices (name, host, port, added_at, enabled) VALUES (?, ?, ?, ?, ?)",
+                [(d['name'], d['host'], d['port'], d.get('added_at') or iso_now(), int(d.get('enabled', True)))
+                 for d in devices]
+            )
+        logger.info(f"Imported {len(devices)} devices from {self.import_file}")
+
+    def _set_devices(self, devices: Tuple[Dict[str, Any], ...]):
+        """Publish a new device snapshot and rebuild the lookup indices"""
+        self._by_name = {d['name']: d for d in devices}
+        self._by_hostport = {(d['host'], d['port']): d for d in devices}
+        self._publish(devices)
+
+    def _publish(self, devices: Tuple[Dict[str, Any], ...]):
+        """Swap in a new device snapshot and its pre-serialized JSON body"""
+        self._devices_json_bytes = _json_dumps({'devices': list(devices)})
+        self._devices = devices
+
     def load_devices(self):
-        """Load devices from JSON file"""
+        """Load devices from the database"""
         with devices_lock:
             try:
-                if os.path.exists(self.devices_file):
-                    with open(self.devices_file, 'r') as f:
-                        self.devices = json.load(f)
-                    logger.info(f"Loaded {len(self.devices)} devices from {self.devices_file}")
-                else:
-                    self.devices = []
-                    self.save_devices()
+                if self._db.execute("SELECT COUNT(*) FROM devices").fetchone()[0] == 0:
+                    self._import_json()
+                rows = self._db.execute(
+                    "SELECT name, host, port, added_at, enabled FROM devices ORDER BY rowid"
+                ).fetchall()
+                self._set_devices(tuple(
+                    {'name': name, 'host': host, 'port': port, 'added_at': added_at, 'enabled': bool(enabled)}
+                    for name, host, port, added_at, enabled in rows
+                ))
+                logger.info(f"Loaded {len(self._devices)} devices from {self.db_path}")
             except Exception as e:
                 logger.error(f"Error loading devices: {e}")
-                self.devices = []
-
-    def save_devices(self):
-        """Save devices to JSON file"""
-        try:
-            # Atomic write
-            temp_file = self.devices_file + '.tmp'
-            with open(temp_file, 'w') as f:
-                json.dump(self.devices, f, indent=2)
-            os.rename(temp_file, self.devices_file)
-            logger.info(f"Saved {len(self.devices)} devices to {self.devices_file}")
-        except Exception as e:
-            logger.error(f"Error saving devices: {e}")
+                self._set_devices(())
 
     def add_device(self, name: str, host: str, port: int) -> bool:
         """Add a new device to monitor"""
         with devices_lock:
             # Check for duplicates
-            for device in self.devices:
-                if device['host'] == host and device['port'] == port:
-                    logger.warning(f"Device {host}:{port} already exists")
-                    return False
-                if device['name'] == name:
-                    logger.warning(f"Device name '{name}' already exists")
-                    return False
-
-            self.devices.append({
+            if (host, port) in self._by_hostport:
+                logger.warning(f"Device {host}:{port} already exists")
+                return False
+            if name in self._by_name:
+                logger.warning(f"Device name '{name}' already exists")
+                return False
+
+            device = {
                 'name': name,
                 'host': host,
                 'port': port,
                 'added_at': datetime.now().isoformat(),
                 'enabled': True
-            })
-            self.save_devices()
+            }
+            try:
+                with self._db:
+                    self._db.execute(
+                        "INSERT INTO devices (name, host, port, added_at, enabled) VALUES (?, ?, ?, ?, 1)",
+                        (name, host, port, device['added_at'])
+                    )
+            except sqlite3.IntegrityError:
+                logger.warning(f"Device {name} ({host}:{port}) already exists")
+                return False
+            self._by_name[name] = device
+            self._by_hostport[(host, port)] = device
+            self._publish(self._devices + (device,))
             logger.info(f"Added device: {name} ({host}:{port})")
             return True
 
     def remove_device(self, name: str) -> bool:
         """Remove a device from monitoring"""
         with devices_lock:
-            original_length = len(self.devices)
-            self.devices = [d for d in self.devices if d['name'] != name]
-            if len(self.devices) < original_length:
-                self.save_devices()
-                logger.info(f"Removed device: {name}")
-                return True
-            return False
-
-    def get_devices(self) -> List[Dict[str, Any]]:
-        """Get all devices"""
-        with devices_lock:
-            return self.devices.copy()
+            device = self._by_name.get(name)
+            if device is None:
+                return False
+            with self._db:
+                self._db.execute("DELETE FROM devices WHERE name = ?", (name,))
+            del self._by_name[name]
+            self._by_hostport.pop((device['host'], device['port']), None)
+            self._publish(tuple(d for d in self._devices if d is not device))
+            logger.info(f"Removed device: {name}")
+            return True
+
+    def get_devices(self, mutable: bool = False):
+        """Get all devices
+
+        Returns the shared snapshot tuple, which callers must treat as
+        read-only. Pass mutable=True for a private list of device copies.
+        """
+        if mutable:
+            return [dict(device) for device in self._devices]
+        return self._devices
+
+    def get_devices_json(self) -> bytes:
+        """Get the device list pre-serialized as a JSON response body"""
+        return self._devices_json_bytes
 
     def update_device(self, name: str, enabled: bool) -> bool:
         """Enable/disable a device"""
         with devices_lock:
-            for device in self.devices:
-                if device['name'] == name:
-                    device['enabled'] = enabled
-                    self.save_devices()
-                    logger.info(f"Updated device {name}: enabled={enabled}")
-                    return True
-            return False
+            device = self._by_name.get(name)
+            if device is None:
+                return False
+            with self._db:
+                self._db.execute("UPDATE devices SET enabled = ? WHERE name = ?", (int(enabled), name))
+            updated = dict(device, enabled=enabled)
+            self._by_name[name] = updated
+            self._by_hostport[(device['host'], device['port'])] = updated
+            self._publish(tuple(updated if d is device else d for d in self._devices))
+            logger.info(f"Updated device {name}: enabled={enabled}")
+            return True
 
 
 class MetricsCollector:
@@ -132,6 +331,52 @@ class MetricsCollector:
     def __init__(self, device_manager: DeviceManager):
         self.device_manager = device_manager
         self.timeout = AGENT_TIMEOUT
+        # One persistent proxy per agent; the lock serializes use of its connection
+        self._proxies: Dict[Tuple[str, int], Tuple[xmlrpc.client.ServerProxy, Lock]] = {}
+        self._proxies_lock = Lock()
+        # Unreachable agents: (host, port) -> (consecutive failures, next attempt, last error)
+        self._failures: Dict[Tuple[str, int], Tuple[int, float, str]] = {}
+        # Shared across polls so worker threads are not recreated each cycle
+        self._executor = ThreadPoolExecutor(max_workers=MAX_WORKERS,
+                                            thread_name_prefix='dashboard-collect')
+        # Optional single-threaded async fan-out on a long-lived event loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http = None
+        if ASYNC_COLLECT:
+            if httpx is None:
+                logger.warning("ASYNC_COLLECT requires httpx; falling back to thread pool")
+            else:
+                self._start_async_loop()
+        # Single-flight result cache: concurrent callers share one collection,
+        # and results stay fresh for half a poll interval
+        self._collect_cond = Condition()
+        self._collecting = False
+        self._cache_ttl = POLL_INTERVAL / 2
+        self._last_collect_ts = 0.0
+        self._last_devices = None
+        self._last_result: Optional[Dict[str, Any]] = None
+        # Metrics persistence is debounced: polls mark the snapshot dirty and
+        # a background flusher writes it at most once per interval
+        self._dirty = Event()
+        # The flusher thread and the atexit hook can flush at the same time;
+        # both write through the same temp file, so flushes are serialized
+        self._flush_lock = Lock()
+        self._flush_interval = max(POLL_INTERVAL / 2, 1)
+        Thread(target=self._flush_loop, name='dashboard-flush', daemon=True).start()
+        atexit.register(self._flush_pending)
+
+    def _start_async_loop(self):
+        """Run an event loop in a daemon thread and open a shared keep-alive client on it"""
+        self._loop = asyncio.new_event_loop()
+        Thread(target=self._loop.run_forever, name='dashboard-async', daemon=True).start()
+
+        async def make_client():
+            return httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=min(CONNECT_TIMEOUT, self.timeout)),
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=MAX_WORKERS)
+            )
+
+        self._http = asyncio.run_coroutine_threadsafe(make_client(), self._loop).result()
 
     def collect_from_device(self, device: Dict[str, Any]) -> Dict[str, Any]:
         """Collect metrics from a single device"""
@@ -142,21 +387,23 @@ class MetricsCollector:
                 'error': 'Device is disabled'
             }
 
+        stub = self._backoff_stub(device)
+        if stub is not None:
+            return stub
+
         try:
-            url = f"http://{device['host']}:{device['port']}"
-            proxy = xmlrpc.client.ServerProxy(url, allow_none=True)
-            
-            # Test connection
-            ping_result = proxy.ping()
+            proxy, proxy_lock = self._get_proxy(device['host'], device['port'])
             
-            # Get metrics
-            metrics = proxy.get_metrics()
+            # Get metrics; a failure here is what marks the agent as down
+            with proxy_lock:
+                metrics = proxy.get_metrics()
             
             # Add metadata
             metrics['device_name'] = device['name']
             metrics['status'] = 'success'
-            metrics['collection_time'] = datetime.now().isoformat()
+            metrics['collection_time'] = iso_now()
             
+            self._failures.pop((device['host'], device['port']), None)
             return metrics
             
         except xmlrpc.client.Fault as e:
@@ -164,21 +411,146 @@ class MetricsCollector:
                 'name': device['name'],
                 'status': 'error',
                 'error': f"XML-RPC fault: {e.faultString}",
-                'collection_time': datetime.now().isoformat()
+                'collection_time': iso_now()
             }
         except Exception as e:
+            return self._record_failure(device, str(e))
+
+    def _backoff_stub(self, device: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Error result for a device still inside its backoff window, else None"""
+        state = self._failures.get((device['host'], device['port']))
+        if state is None:
+            return None
+        count, next_attempt, error = state
+        remaining = next_attempt - time.monotonic()
+        if remaining <= 0:
+            return None
+        return {
+            'name': device['name'],
+            'status': 'error',
+            'error': f"{error} (retry in {int(remaining) + 1}s)",
+            'collection_time': iso_now()
+        }
+
+    def _record_failure(self, device: Dict[str, Any], error: str) -> Dict[str, Any]:
+        """Back off exponentially (capped at 5 minutes) and build the error result"""
+        key = (device['host'], device['port'])
+        count = self._failures.get(key, (0, 0.0, ''))[0] + 1
+        self._failures[key] = (count, time.monotonic() + min(300, 2 ** count), error)
+        return {
+            'name': device['name'],
+            'status': 'error',
+            'error': error,
+            'collection_time': iso_now()
+        }
+
+    async def collect_from_device_async(self, device: Dict[str, Any]) -> Dict[str, Any]:
+        """Collect metrics from a single device over the shared async HTTP client"""
+        if not device.get('enabled', True):
+            return {
+                'name': device['name'],
+                'status': 'disabled',
+                'error': 'Device is disabled'
+            }
+
+        stub = self._backoff_stub(device)
+        if stub is not None:
+            return stub
+
+        try:
+            body = xmlrpc.client.dumps((), 'get_metrics', allow_none=True).encode('utf-8')
+            response = await self._http.post(
+                f"http://{device['host']}:{device['port']}/RPC2",
+                content=body,
+                headers={'Content-Type': 'text/xml'}
+            )
+            response.raise_for_status()
+            (metrics,), _ = xmlrpc.client.loads(response.content)
+            
+            # Add metadata
+            metrics['device_name'] = device['name']
+            metrics['status'] = 'success'
+            metrics['collection_time'] = iso_now()
+            
+            self._failures.pop((device['host'], device['port']), None)
+            return metrics
+            
+        except xmlrpc.client.Fault as e:
             return {
                 'name': device['name'],
                 'status': 'error',
-                'error': str(e),
-                'collection_time': datetime.now().isoformat()
+                'error': f"XML-RPC fault: {e.faultString}",
+                'collection_time': iso_now()
             }
+        except Exception as e:
+            return self._record_failure(device, str(e))
+
+    async def _collect_all_async(self, devices) -> List[Dict[str, Any]]:
+        """Collect from all devices concurrently on the event loop"""
+        return list(await asyncio.gather(*(self.collect_from_device_async(d) for d in devices)))
+
+    def _get_proxy(self, host: str, port: int) -> Tuple[xmlrpc.client.ServerProxy, Lock]:
+        """Get the cached keep-alive proxy for an agent, creating it on first use"""
+        key = (host, port)
+        with self._proxies_lock:
+            entry = self._proxies.get(key)
+            if entry is None:
+                proxy = xmlrpc.client.ServerProxy(
+                    f"http://{host}:{port}",
+                    transport=KeepAliveTransport(self.timeout),
+                    allow_none=True
+                )
+                entry = self._proxies[key] = (proxy, Lock())
+            return entry
+
+    def drop_proxy(self, host: str, port: int):
+        """Forget the cached proxy for an agent and close its connection
+
+        The proxy leaves the map first, so new calls get a fresh one; the
+        close then waits on the proxy's lock for any call still in flight.
+        """
+        self._failures.pop((host, port), None)
+        with self._proxies_lock:
+            entry = self._proxies.pop((host, port), None)
+        if entry is not None:
+            proxy, proxy_lock = entry
+            with proxy_lock:
+                proxy('close')()
 
     def collect_all_metrics(self) -> Dict[str, Any]:
-        """Collect metrics from all enabled devices"""
-        devices = self.device_manager.get_devices()
+        """Collect metrics from all enabled devices
+
+        Returns the previous result while it is younger than the cache TTL
+        and the device list is unchanged; if a collection is already in
+        flight, waits for it instead of starting another.
+        """
+        with self._collect_cond:
+            while True:
+                devices = self.device_manager.get_devices()
+                if (self._last_result is not None and self._last_devices is devices
+                        and time.monotonic() - self._last_collect_ts < self._cache_ttl):
+                    return self._last_result
+                if not self._collecting:
+                    break
+                self._collect_cond.wait()
+            self._collecting = True
+
+        try:
+            results = self._collect_all_metrics(devices)
+            with self._collect_cond:
+                self._last_result = results
+                self._last_devices = devices
+                self._last_collect_ts = time.monotonic()
+        finally:
+            with self._collect_cond:
+                self._collecting = False
+                self._collect_cond.notify_all()
+        return results
+
+    def _collect_all_metrics(self, devices) -> Dict[str, Any]:
+        """Run one collection across the given device snapshot"""
         results = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': iso_now(),
             'devices': [],
             'summary': {
                 'total': len(devices),
@@ -188,44 +560,83 @@ class MetricsCollector:
             }
         }
 
-        for device in devices:
-            result = self.collect_from_device(device)
-            results['devices'].append(result)
-            
-            if result.get('status') == 'success':
-                results['summary']['success'] += 1
-            elif result.get('status') == 'error':
-                results['summary']['error'] += 1
-            else:
-                results['summary']['disabled'] += 1
+        # Device calls are pure I/O wait, so fan them out
+        if self._loop is not None:
+            results['devices'] = asyncio.run_coroutine_threadsafe(
+                self._collect_all_async(devices), self._loop).result()
+        else:
+            results['devices'] = list(self._executor.map(self.collect_from_device, devices))
+
+        statuses = Counter(result.get('status') for result in results['devices'])
+        results['summary'].update(
+            success=statuses['success'],
+            error=statuses['error'],
+            disabled=len(devices) - statuses['success'] - statuses['error']
+        )
 
-        # Update cache
-        with metrics_cache_lock:
-            metrics_cache.update(results)
+        # Publish the new snapshot
+        metrics_cache_ref[0] = results
         
-        # Persist latest metrics
-        self.save_metrics(results)
+        # Persist latest metrics (written by the flusher thread)
+        self._dirty.set()
         
         return results
 
     def save_metrics(self, metrics: Dict[str, Any]):
         """Save latest metrics to file for persistence"""
         try:
-            temp_file = METRICS_FILE + '.tmp'
-            with open(temp_file, 'w') as f:
-                json.dump(metrics, f, indent=2)
-            os.rename(temp_file, METRICS_FILE)
+            if _metrics_file_is_msgpack():
+                data = msgpack.packb(metrics, use_bin_type=True, default=str)
+            else:
+                data = _json_dumps(metrics)
+            _atomic_write(METRICS_FILE, data)
         except Exception as e:
             logger.error(f"Error saving metrics: {e}")
 
+    def _flush_pending(self):
+        """Write the current snapshot if it changed since the last write"""
+        with self._flush_lock:
+            if self._dirty.is_set():
+                self._dirty.clear()
+                self.save_metrics(metrics_cache_ref[0])
+
+    def _flush_loop(self):
+        """Background flusher coalescing metrics writes"""
+        while True:
+            self._dirty.wait()
+            time.sleep(self._flush_interval)
+            self._flush_pending()
+
+    def load_metrics(self) -> Dict[str, Any]:
+        """Load last persisted metrics, if any"""
+        try:
+            if not os.path.exists(METRICS_FILE):
+                return {}
+            with open(METRICS_FILE, 'rb') as f:
+                data = f.read()
+            if _metrics_file_is_msgpack():
+                return msgpack.unpackb(data, raw=False)
+            return _json_loads(data)
+        except Exception as e:
+            logger.error(f"Error loading metrics: {e}")
+            return {}
+
 
 # Initialize managers
-device_manager = DeviceManager(DEVICES_FILE)
+device_manager = DeviceManager(DEVICES_DB, import_file=DEVICES_FILE)
 metrics_collector = MetricsCollector(device_manager)
 
 
 # Flask Routes
 
+def json_response(obj: Any, code: int = 200) -> Response:
+    """JSON response serialized straight to bytes, bypassing jsonify"""
+    return Response(_json_dumps(obj), status=code, mimetype='application/json')
+
+
+# (monotonic second, device snapshot, serialized body) for /api/health
+_health_cache: List[Tuple[int, Any, bytes]] = [(-1, None, b'')]
+
 @app.route('/')
 def index():
     """Main dashboard page"""
@@ -237,8 +648,7 @@ def index():
 @app.route('/api/devices', methods=['GET'])
 def get_devices():
     """Get list of all devices"""
-    devices = device_manager.get_devices()
-    return jsonify({'devices': devices})
+    return Response(device_manager.get_devices_json(), mimetype='application/json')
 
 
 @app.route('/api/devices', methods=['POST'])
@@ -276,8 +686,11 @@ def add_device():
 @app.route('/api/devices/<name>', methods=['DELETE'])
 def remove_device(name):
     """Remove a device"""
+    removed = [d for d in device_manager.get_devices() if d['name'] == name]
     success = device_manager.remove_device(name)
     if success:
+        for device in removed:
+            metrics_collector.drop_proxy(device['host'], device['port'])
         return jsonify({'success': True, 'message': f'Device {name} removed successfully'})
     else:
         return jsonify({'error': 'Device not found'}), 404
@@ -299,36 +712,52 @@ def toggle_device(name):
 def get_metrics():
     """Get latest metrics from all devices"""
     metrics = metrics_collector.collect_all_metrics()
-    return jsonify(metrics)
+    return json_response(metrics)
 
 
 @app.route('/api/metrics/cache', methods=['GET'])
 def get_cached_metrics():
     """Get cached metrics without collecting"""
-    with metrics_cache_lock:
-        if not metrics_cache:
-            return jsonify({'error': 'No metrics available yet'}), 404
-        return jsonify(metrics_cache.copy())
+    metrics_cache = metrics_cache_ref[0]
+    if not metrics_cache:
+        return jsonify({'error': 'No metrics available yet'}), 404
+    return json_response(metrics_cache)
 
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
-        'devices_count': len(device_manager.get_devices())
-    })
-
-
-def main():
-    """Main entry point"""
+    devices = device_manager.get_devices()
+    second = int(time.monotonic())
+    cached_second, cached_devices, body = _health_cache[0]
+    if cached_second != second or cached_devices is not devices:
+        body = _json_dumps({
+            'status': 'healthy',
+            'timestamp': iso_now(),
+            'devices_count': len(devices)
+        })
+        _health_cache[0] = (second, devices, body)
+    return Response(body, mimetype='application/json')
+
+
+def startup():
+    """Load state and warm the metrics cache before serving requests"""
     # Load any existing devices
     device_manager.load_devices()
     
+    # Seed the cache from the last persisted metrics
+    last_metrics = metrics_collector.load_metrics()
+    if last_metrics:
+        metrics_cache_ref[0] = last_metrics
+    
     # Initial metrics collection
     logger.info("Performing initial metrics collection...")
     metrics_collector.collect_all_metrics()
+
+
+def main():
+    """Main entry point (development server; use gunicorn in production)"""
+    startup()
     
     # Start Flask app
     host = os.environ.get('DASHBOARD_HOST', '0.0.0.0')
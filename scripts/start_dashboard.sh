@@ -22,5 +22,10 @@ echo "Dashboard will be available at: http://$HOST:$PORT"
 echo ""
 echo "Press Ctrl+C to stop"
 
-# Start the dashboard
-python3 dashboard.py
+# Start the dashboard (gunicorn when available, Flask dev server otherwise)
+if python3 -c "import gunicorn" 2>/dev/null; then
+    exec python3 -m gunicorn -c config/gunicorn.conf.py dashboard:app
+else
+    echo "gunicorn not installed; using the Flask development server"
+    exec python3 dashboard.py
+fi
@@ -13,7 +13,9 @@ CREATE TABLE IF NOT EXISTS metrics (
     id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
     agent_name VARCHAR(255) NOT NULL,
     metric_type VARCHAR(100) NOT NULL,
-    value TEXT NOT NULL,
+    -- Numeric samples go to value_num, anything else (JSON payloads) to value_text
+    value_num DOUBLE NULL,
+    value_text TEXT NULL,
     metadata JSON,
     timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_agent_name (agent_name),
@@ -91,7 +93,7 @@ CREATE TABLE IF NOT EXISTS system_info (
 
 -- View for latest metrics (useful for dashboards)
 CREATE OR REPLACE VIEW latest_metrics AS
-SELECT agent_name, metric_type, value, timestamp
+SELECT agent_name, metric_type, COALESCE(value_num, value_text) AS value, timestamp
 FROM metrics m1
 WHERE timestamp = (
     SELECT MAX(timestamp)
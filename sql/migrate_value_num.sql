@@ -0,0 +1,29 @@
+-- One-shot migration for metrics tables created with a single `value TEXT` column.
+-- Numeric samples move to value_num (DOUBLE) so AVG/MIN/MAX run in MySQL;
+-- everything else (JSON payloads) moves to value_text.
+
+USE monitoring;
+
+ALTER TABLE metrics
+    ADD COLUMN value_num DOUBLE NULL AFTER metric_type,
+    ADD COLUMN value_text TEXT NULL AFTER value_num;
+
+UPDATE metrics
+SET value_num = value + 0
+WHERE value REGEXP '^[[:space:]]*[-+]?([0-9]+[.]?[0-9]*|[.][0-9]+)([eE][-+]?[0-9]+)?[[:space:]]*$';
+
+UPDATE metrics
+SET value_text = value
+WHERE value_num IS NULL;
+
+ALTER TABLE metrics DROP COLUMN value;
+
+CREATE OR REPLACE VIEW latest_metrics AS
+SELECT agent_name, metric_type, COALESCE(value_num, value_text) AS value, timestamp
+FROM metrics m1
+WHERE timestamp = (
+    SELECT MAX(timestamp)
+    FROM metrics m2
+    WHERE m1.agent_name = m2.agent_name 
+    AND m1.metric_type = m2.metric_type
+);
@@ -24,17 +24,31 @@ Usage:
 __version__ = "1.0.0"
 __author__ = "Monitoring System"
 
-from .storage import (
-    StorageBackend,
-    LogStorage,
-    MySQLStorage,
-    SQLiteStorage,
-    create_storage
-)
-
-from .agent import Agent, MetricsCollector
-from .collector import Collector, AgentConnection, ThresholdMonitor
-from .visualization import Visualizer
+# Submodules are imported on first attribute access (PEP 562), so running
+# the agent does not pull in the collector, storage or plotting stacks.
+_EXPORTS = {
+    "StorageBackend": ".storage",
+    "LogStorage": ".storage",
+    "MySQLStorage": ".storage",
+    "SQLiteStorage": ".storage",
+    "create_storage": ".storage",
+    "Agent": ".agent",
+    "MetricsCollector": ".agent",
+    "Collector": ".collector",
+    "AgentConnection": ".collector",
+    "ThresholdMonitor": ".collector",
+    "Visualizer": ".visualization",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "Agent",
@@ -4,13 +4,16 @@ Provides system metrics via XML-RPC.
 """
 
 import os
+import re
 import sys
+import glob
 import json
 import logging
 import platform
+import socketserver
 import xmlrpc.server
-import xmlrpc.client
-from socketserver import ThreadingMixIn
+from concurrent.futures import ThreadPoolExecutor, wait
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 import threading
@@ -23,6 +26,17 @@ except ImportError:
     print("Error: psutil not installed. Install with: pip install psutil")
     sys.exit(1)
 
+# Optional faster encodings for the JSON/msgpack RPC endpoint
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,19 +45,221 @@ logging.basicConfig(
 logger = logging.getLogger("Agent")
 
 
-class ThreadedXMLRPCServer(ThreadingMixIn, xmlrpc.server.SimpleXMLRPCServer):
-    """Threaded XML-RPC server for handling multiple concurrent requests."""
+# hwmon driver names of CPU temperature sensors, in order of preference
+HWMON_CPU_SENSORS = ("coretemp", "k10temp", "cpu_thermal")
+
+
+# Command-line fragments of suspicious processes, matched in a single scan
+SUSPICIOUS_PROCESSES = (
+    "nc -l", "netcat -l",  # Listening network shells
+    "ncat -l",
+    "python -m SimpleHTTPServer",  # Unintentional file servers
+)
+SUSPICIOUS_CMDLINE_RE = re.compile("|".join(map(re.escape, SUSPICIOUS_PROCESSES)))
+
+# Failed-login markers counted in the auth log, and how it is read
+FAILED_LOGIN_MARKERS = (b"Failed password", b"authentication failure")
+AUTH_LOG_INITIAL_TAIL = 16384
+AUTH_LOG_READ_CHUNK = 1 << 20
+
+# Non-XML request encodings understood by AgentRequestHandler
+RPC_CONTENT_TYPES = frozenset(
+    ("application/json", "application/msgpack") if msgpack is not None else ("application/json",)
+)
+
+# Common backdoor ports; hex form matches /proc/net/tcp local addresses
+UNUSUAL_PORTS = (31337, 12345, 54321)
+UNUSUAL_PORTS_HEX = frozenset(f"{port:04X}" for port in UNUSUAL_PORTS)
+TCP_LISTEN_STATE = "0A"
+
+
+class ThreadedXMLRPCServer(socketserver.ThreadingMixIn, xmlrpc.server.SimpleXMLRPCServer):
+    """XML-RPC server handling at most max_workers connections at once.
+
+    Each connection gets a daemon thread, so idle keep-alive clients never
+    hold up shutdown; connections beyond the limit are answered 503 and
+    closed instead of being queued.
+    """
     allow_reuse_address = True
     daemon_threads = True
 
+    def __init__(self, *args, max_workers: int = 16, **kwargs):
+        kwargs.setdefault("requestHandler", AgentRequestHandler)
+        super().__init__(*args, **kwargs)
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def process_request(self, request, client_address):
+        """Start a handler thread if a slot is free, else reject the connection."""
+        if not self._slots.acquire(blocking=False):
+            self._reject(request)
+            return
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._slots.release()
+
+    def _reject(self, request):
+        """Answer 503 on a connection that arrived while every slot was busy."""
+        try:
+            request.sendall(b"HTTP/1.1 503 Service Unavailable\r\n"
+                            b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+
+# Threat types and severities shared by every threat dict
+THREAT_BRUTE_FORCE = sys.intern("brute_force")
+THREAT_SUSPICIOUS_PROCESS = sys.intern("suspicious_process")
+THREAT_UNUSUAL_PORT = sys.intern("unusual_port")
+SEVERITY_HIGH = sys.intern("high")
+SEVERITY_MEDIUM = sys.intern("medium")
+
+
+class Threat:
+    """A detected security threat; kept compact until it is serialized."""
+    __slots__ = ("type", "severity", "description", "timestamp")
+
+    def __init__(self, type: str, severity: str, description: str, timestamp: str):
+        self.type = type
+        self.severity = severity
+        self.description = description
+        self.timestamp = timestamp
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "severity": self.severity,
+            "description": self.description,
+            "timestamp": self.timestamp
+        }
+
+
+def _rpc_encode(obj: Any, content_type: str) -> bytes:
+    """Serialize an RPC response in the requested encoding."""
+    if content_type == "application/msgpack":
+        return msgpack.packb(obj, use_bin_type=True, default=str)
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str).encode("utf-8")
+
+
+def _rpc_decode(data: bytes, content_type: str) -> Any:
+    """Parse an RPC request body in the given encoding."""
+    if content_type == "application/msgpack":
+        return msgpack.unpackb(data, raw=False)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class AgentRequestHandler(xmlrpc.server.SimpleXMLRPCRequestHandler):
+    """XML-RPC request handler that also answers JSON-RPC and msgpack-RPC calls.
+
+    POSTs with Content-Type application/json (or application/msgpack when
+    msgpack is installed) carry a JSON-RPC 2.0 style request object and are
+    dispatched to the same agent methods; everything else is XML-RPC.
+    """
+    rpc_paths = ("/", "/RPC2", "/rpc")
+
+    # Keep collector connections open across the default 10s poll interval,
+    # but drop idle ones soon after: each open connection holds a server slot
+    protocol_version = "HTTP/1.1"
+    timeout = 15
+
+    def do_POST(self):
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+        if content_type not in RPC_CONTENT_TYPES:
+            return super().do_POST()
+
+        if not self.is_rpc_path_valid():
+            self.report_404()
+            return
+
+        try:
+            length = int(self.headers["content-length"])
+            request = _rpc_decode(self.rfile.read(length), content_type)
+            request_id = request.get("id")
+            try:
+                result = self.server._dispatch(request["method"], request.get("params", []))
+                response = {"jsonrpc": "2.0", "result": result, "id": request_id}
+            except Exception as e:
+                response = {
+                    "jsonrpc": "2.0",
+                    "error": {"code": -32000, "message": f"{type(e).__name__}: {e}"},
+                    "id": request_id
+                }
+            body = _rpc_encode(response, content_type)
+        except Exception as e:
+            logger.error(f"Error handling {content_type} RPC request: {e}")
+            self.send_response(500)
+            self.send_header("Content-length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-type", content_type)
+        self.send_header("Content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
 
 class MetricsCollector:
     """Collects system metrics from the monitored machine."""
 
-    def __init__(self):
+    # Getters that may block and so run on the pool under a deadline; the
+    # rest read in-memory snapshots or cheap kernel counters and run inline
+    _SLOW_GETTERS = ("cpu_temperature", "security_threats")
+
+    def __init__(self, max_requests: int = 16):
+        # Constant for the process lifetime; avoid a uname() per request
+        self._platform = platform.system()
+        self._hostname = platform.node()
+        # Systems without load average (e.g., Windows) always report zeros
+        self._get_load = os.getloadavg if hasattr(os, "getloadavg") else lambda: (0.0, 0.0, 0.0)
+
         self._cpu_temp_cache = None
         self._cpu_temp_cache_time = 0
         self._cache_ttl = 5  # Cache temperature for 5 seconds
+        self._threats_cache: List[Dict[str, Any]] = []
+        self._threats_cache_time = 0
+        self._threats_ttl = 30  # Threats change slowly; re-check every 30 seconds
+        # Held by the one caller refreshing the threats; also guards _auth_state,
+        # which is only touched during a refresh
+        self._threats_lock = threading.Lock()
+        self._hwmon_path: Optional[str] = None
+        self._hwmon_probed = False
+        # Incremental reader state for the auth log
+        self._auth_state = {
+            "path": None,
+            "inode": None,
+            "offset": 0,
+            "window": 600,  # seconds of failures counted towards the threshold
+            "events": deque()  # (monotonic timestamp, failed logins seen)
+        }
+        # Thermal zone sensor files are discovered once, not stat-ed per read
+        self._thermal_paths = [
+            zone + "/temp" for zone in sorted(glob.glob("/sys/class/thermal/thermal_zone*"))
+            if os.path.exists(zone + "/temp")
+        ]
+
+        # CPU usage is sampled in the background so requests never block;
+        # prime psutil so the first non-blocking call has a baseline
+        self._cpu_last = psutil.cpu_percent(interval=None)
+        self._cpu_stop = threading.Event()
+        self._cpu_thread: Optional[threading.Thread] = None
+
+        # Persistent pool for the getters that can block (sensor reads, threat
+        # scans); sized so every concurrent request gets its own workers
+        self._pool = ThreadPoolExecutor(max_workers=max_requests * len(self._SLOW_GETTERS),
+                                        thread_name_prefix="metrics")
 
     def get_cpu_temperature(self) -> Optional[float]:
         """
@@ -63,7 +279,7 @@ class MetricsCollector:
             return self._cpu_temp_cache
 
         temperature = None
-        system = platform.system()
+        system = self._platform
 
         try:
             if system == "Linux":
@@ -83,9 +299,39 @@ class MetricsCollector:
 
         return temperature
 
+    def _probe_hwmon_path(self) -> Optional[str]:
+        """Find the temp*_input file of the CPU hwmon device, if any."""
+        devices = {}
+        for hwmon_dir in glob.glob("/sys/class/hwmon/hwmon*"):
+            try:
+                with open(os.path.join(hwmon_dir, "name"), "r") as f:
+                    devices.setdefault(f.read().strip(), hwmon_dir)
+            except OSError:
+                pass
+
+        for name in HWMON_CPU_SENSORS:
+            hwmon_dir = devices.get(name)
+            if hwmon_dir is None:
+                continue
+            inputs = glob.glob(os.path.join(hwmon_dir, "temp*_input"))
+            if inputs:
+                return min(inputs, key=lambda p: int(re.search(r"temp(\d+)_input$", p).group(1)))
+        return None
+
     def _get_linux_temperature(self) -> Optional[float]:
         """Get temperature on Linux systems."""
-        # Try psutil first (works on most systems)
+        # Fast path: read the CPU hwmon sensor file found on the first call
+        if not self._hwmon_probed:
+            self._hwmon_path = self._probe_hwmon_path()
+            self._hwmon_probed = True
+        if self._hwmon_path is not None:
+            try:
+                with open(self._hwmon_path, "r") as f:
+                    return int(f.read()) / 1000.0
+            except (OSError, ValueError):
+                self._hwmon_path = None
+
+        # Try psutil (works on most systems)
         try:
             temps = psutil.sensors_temperatures()
             if temps:
@@ -103,15 +349,12 @@ class MetricsCollector:
 
         # Fallback: try reading from thermal zones
         thermal_zones = []
-        for i in range(10):
-            thermal_path = f"/sys/class/thermal/thermal_zone{i}"
-            if os.path.exists(thermal_path):
-                try:
-                    with open(f"{thermal_path}/temp", "r") as f:
-                        temp_millidegrees = int(f.read().strip())
-                        thermal_zones.append(temp_millidegrees / 1000.0)
-                except Exception:
-                    pass
+        for thermal_path in self._thermal_paths:
+            try:
+                with open(thermal_path, "r") as f:
+                    thermal_zones.append(int(f.read()) / 1000.0)
+            except Exception:
+                pass
 
         if thermal_zones:
             # Return average of all thermal zones
@@ -143,13 +386,42 @@ class MetricsCollector:
             pass
         return None
 
+    def start_cpu_sampler(self, interval: float = 0.5):
+        """Start the background thread that keeps the CPU usage sample fresh."""
+        if self._cpu_thread is not None and self._cpu_thread.is_alive():
+            return
+        self._cpu_stop.clear()
+        self._cpu_thread = threading.Thread(
+            target=self._cpu_sampler_loop, args=(interval,),
+            name="cpu-sampler", daemon=True
+        )
+        self._cpu_thread.start()
+
+    def stop_cpu_sampler(self):
+        """Stop the background CPU sampler."""
+        self._cpu_stop.set()
+
+    def _cpu_sampler_loop(self, interval: float):
+        """Refresh the CPU usage sample every interval seconds."""
+        while not self._cpu_stop.is_set():
+            try:
+                self._cpu_last = psutil.cpu_percent(interval=interval)
+            except Exception as e:
+                logger.error(f"Failed to sample CPU usage: {e}")
+                self._cpu_stop.wait(interval)
+
     def get_cpu_usage(self) -> float:
         """
         Get current CPU usage percentage.
         Returns percentage (0-100).
+        
+        Returns the latest background sample without blocking; when the
+        sampler is not running, measures usage since the previous call.
         """
+        if self._cpu_thread is not None and self._cpu_thread.is_alive():
+            return self._cpu_last
         try:
-            return psutil.cpu_percent(interval=1)
+            return psutil.cpu_percent(interval=None)
         except Exception as e:
             logger.error(f"Failed to get CPU usage: {e}")
             return 0.0
@@ -160,20 +432,15 @@ class MetricsCollector:
         Returns dict with '1min', '5min', '15min' keys.
         """
         try:
-            load_avg = os.getloadavg()
-            return {
-                "1min": load_avg[0],
-                "5min": load_avg[1],
-                "15min": load_avg[2]
-            }
-        except Exception as e:
+            load_avg = self._get_load()
+        except OSError as e:
             logger.error(f"Failed to get system load: {e}")
-            # On systems without load average (e.g., Windows)
-            return {
-                "1min": 0.0,
-                "5min": 0.0,
-                "15min": 0.0
-            }
+            load_avg = (0.0, 0.0, 0.0)
+        return {
+            "1min": load_avg[0],
+            "5min": load_avg[1],
+            "15min": load_avg[2]
+        }
 
     def get_memory_usage(self) -> Dict[str, Any]:
         """Get memory usage statistics."""
@@ -219,23 +486,46 @@ class MetricsCollector:
         - Failed login attempts
         - Suspicious processes
         - Port scans (basic)
+        
+        Results are cached for _threats_ttl seconds. Only one caller refreshes
+        at a time; concurrent callers get the previous result meanwhile.
         """
+        if time.time() - self._threats_cache_time < self._threats_ttl:
+            return self._threats_cache
+        if not self._threats_lock.acquire(blocking=False):
+            return self._threats_cache
+        try:
+            current_time = time.time()
+            if current_time - self._threats_cache_time < self._threats_ttl:
+                return self._threats_cache
+            return self._refresh_security_threats(current_time)
+        finally:
+            self._threats_lock.release()
+
+    def _refresh_security_threats(self, current_time: float) -> List[Dict[str, Any]]:
+        """Run the platform's threat checks and cache the result; caller holds _threats_lock."""
         threats = []
-        system = platform.system()
+        system = self._platform
+        # One timestamp for every threat found in this pass
+        timestamp = datetime.now().isoformat()
 
         try:
             if system == "Linux":
-                threats.extend(self._check_linux_security())
+                threats.extend(self._check_linux_security(timestamp))
             elif system == "Windows":
-                threats.extend(self._check_windows_security())
+                threats.extend(self._check_windows_security(timestamp))
             elif system == "Darwin":
-                threats.extend(self._check_macos_security())
+                threats.extend(self._check_macos_security(timestamp))
         except Exception as e:
             logger.error(f"Failed to check security threats: {e}")
 
-        return threats
+        # Update cache; convert to plain dicts once, at the RPC boundary
+        self._threats_cache = [threat.as_dict() for threat in threats]
+        self._threats_cache_time = current_time
 
-    def _check_linux_security(self) -> List[Dict[str, Any]]:
+        return self._threats_cache
+
+    def _check_linux_security(self, timestamp: str) -> List["Threat"]:
         """Check for security issues on Linux."""
         threats = []
 
@@ -248,22 +538,22 @@ class MetricsCollector:
         for log_path in auth_log_paths:
             if os.path.exists(log_path):
                 try:
-                    # Check last 50 lines for failed login attempts
-                    with open(log_path, "r") as f:
-                        lines = f.readlines()[-50:]
-                    
-                    failed_logins = 0
-                    for line in lines:
-                        if "Failed password" in line or "authentication failure" in line:
-                            failed_logins += 1
+                    # Failed logins within the rolling window
+                    now = time.monotonic()
+                    events = self._auth_state["events"]
+                    new_failures = self._count_new_failed_logins(log_path)
+                    if new_failures:
+                        events.append((now, new_failures))
+                    while events and now - events[0][0] > self._auth_state["window"]:
+                        events.popleft()
+                    failed_logins = sum(count for _, count in events)
                     
                     if failed_logins > 10:
-                        threats.append({
-                            "type": "brute_force",
-                            "severity": "high",
-                            "description": f"Multiple failed SSH login attempts detected ({failed_logins})",
-                            "timestamp": datetime.now().isoformat()
-                        })
+                        threats.append(Threat(
+                            THREAT_BRUTE_FORCE, SEVERITY_HIGH,
+                            f"Multiple failed SSH login attempts detected ({failed_logins})",
+                            timestamp
+                        ))
                         break
                 except PermissionError:
                     logger.warning(f"Cannot read {log_path} - permission denied")
@@ -272,86 +562,191 @@ class MetricsCollector:
                 break
 
         # Check for suspicious processes
-        suspicious_processes = [
-            "nc -l", "netcat -l",  # Listening network shells
-            "ncat -l",
-            "python -m SimpleHTTPServer",  # Unintentional file servers
-        ]
-
-        for proc in psutil.process_iter(['name', 'cmdline']):
+        for proc in psutil.process_iter(['cmdline']):
             try:
-                cmdline = " ".join(proc.info.get('cmdline') or [])
-                for susp in suspicious_processes:
-                    if susp in cmdline:
-                        threats.append({
-                            "type": "suspicious_process",
-                            "severity": "medium",
-                            "description": f"Suspicious process: {cmdline[:100]}",
-                            "timestamp": datetime.now().isoformat()
-                        })
+                args = proc.info['cmdline']
+                if not args:
+                    continue
+                cmdline = " ".join(args)
+                if SUSPICIOUS_CMDLINE_RE.search(cmdline):
+                    threats.append(Threat(
+                        THREAT_SUSPICIOUS_PROCESS, SEVERITY_MEDIUM,
+                        f"Suspicious process: {cmdline[:100]}",
+                        timestamp
+                    ))
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 pass
 
         # Check for listening on unusual ports
-        unusual_ports = [31337, 12345, 54321]  # Common backdoor ports
-        for conn in psutil.net_connections(kind='inet'):
-            if conn.status == 'LISTEN' and conn.laddr.port in unusual_ports:
-                threats.append({
-                    "type": "unusual_port",
-                    "severity": "high",
-                    "description": f"Process listening on unusual port {conn.laddr.port}",
-                    "timestamp": datetime.now().isoformat()
-                })
+        for port in self._listening_unusual_ports():
+            threats.append(Threat(
+                THREAT_UNUSUAL_PORT, SEVERITY_HIGH,
+                f"Process listening on unusual port {port}",
+                timestamp
+            ))
 
         return threats
 
-    def _check_windows_security(self) -> List[Dict[str, Any]]:
+    def _listening_unusual_ports(self) -> List[int]:
+        """Return the unusual ports that have a TCP listener, sorted.
+
+        Scans /proc/net/tcp{,6} for LISTEN sockets on the target ports,
+        avoiding psutil's full socket table walk and PID correlation.
+        """
+        found = set()
+        scanned = False
+        for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+            try:
+                with open(table, "r") as f:
+                    next(f, None)  # header
+                    for line in f:
+                        cols = line.split()
+                        if cols[3] == TCP_LISTEN_STATE:
+                            port_hex = cols[1].rpartition(":")[2]
+                            if port_hex in UNUSUAL_PORTS_HEX:
+                                found.add(int(port_hex, 16))
+                scanned = True
+            except OSError:
+                pass  # missing table (e.g. IPv6 disabled) or no access
+        if scanned:
+            return sorted(found)
+
+        # No procfs access: fall back to psutil
+        return sorted({conn.laddr.port for conn in psutil.net_connections(kind='inet')
+                       if conn.status == 'LISTEN' and conn.laddr.port in UNUSUAL_PORTS})
+
+    def _count_new_failed_logins(self, log_path: str) -> int:
+        """Count failed logins appended to a log file since the previous check.
+
+        Caller holds _threats_lock, which serializes access to _auth_state.
+
+        Keeps the file's inode and read offset between calls, so each check
+        only reads new bytes; a new inode (rotation) or a shrunken file
+        restarts from the beginning. The first check scans a recent tail.
+        """
+        state = self._auth_state
+        st = os.stat(log_path)
+
+        if log_path != state["path"] or st.st_ino != state["inode"]:
+            first = state["inode"] is None
+            state["path"] = log_path
+            state["inode"] = st.st_ino
+            state["offset"] = max(0, st.st_size - AUTH_LOG_INITIAL_TAIL) if first else 0
+        elif st.st_size < state["offset"]:
+            # Truncated in place
+            state["offset"] = 0
+
+        if st.st_size == state["offset"]:
+            return 0
+
+        # Read appended bytes in bounded chunks, carrying a short tail so a
+        # marker split across two reads is still counted exactly once
+        carry_len = max(map(len, FAILED_LOGIN_MARKERS)) - 1
+        failed = 0
+        carry = b""
+        with open(log_path, "rb") as f:
+            f.seek(state["offset"])
+            while True:
+                chunk = f.read(AUTH_LOG_READ_CHUNK)
+                if not chunk:
+                    break
+                buf = carry + chunk
+                for marker in FAILED_LOGIN_MARKERS:
+                    failed += buf.count(marker) - carry.count(marker)
+                carry = buf[-carry_len:]
+            state["offset"] = f.tell()
+        return failed
+
+    def _check_windows_security(self, timestamp: str) -> List["Threat"]:
         """Check for security issues on Windows."""
         threats = []
         # Windows-specific checks would go here
         # For now, check for suspicious services
         return threats
 
-    def _check_macos_security(self) -> List[Dict[str, Any]]:
+    def _check_macos_security(self, timestamp: str) -> List["Threat"]:
         """Check for security issues on macOS."""
         threats = []
         # macOS-specific checks would go here
         return threats
 
-    def get_all_metrics(self) -> Dict[str, Any]:
-        """Get all system metrics at once."""
-        return {
-            "cpu_temperature": self.get_cpu_temperature(),
-            "cpu_usage": self.get_cpu_usage(),
-            "system_load": self.get_system_load(),
-            "memory": self.get_memory_usage(),
-            "disk": self.get_disk_usage(),
-            "security_threats": self.get_security_threats(),
-            "timestamp": datetime.now().isoformat(),
-            "platform": platform.system(),
-            "hostname": platform.node()
+    def get_all_metrics(self, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get all system metrics at once.
+
+        The slow getters run concurrently on the collector's pool under one
+        shared 2 second deadline while the cheap ones run inline. A getter
+        that fails yields its empty default; one that misses the deadline is
+        left out, so no placeholder is mistaken for a reading. Slow getters
+        keep running in the background, so get_security_threats is
+        single-flight and never piles up scans.
+        If fields is given, only those metrics are collected; timestamp,
+        platform and hostname are always included.
+        """
+        getters = {
+            "cpu_temperature": (self.get_cpu_temperature, None),
+            "cpu_usage": (self.get_cpu_usage, 0.0),
+            "system_load": (self.get_system_load, {}),
+            "memory": (self.get_memory_usage, {}),
+            "disk": (self.get_disk_usage, {}),
+            "security_threats": (self.get_security_threats, []),
         }
+        if fields:
+            wanted = set(fields)
+            getters = {key: spec for key, spec in getters.items() if key in wanted}
+        futures = {key: self._pool.submit(getter) for key, (getter, _) in getters.items()
+                   if key in self._SLOW_GETTERS}
+
+        metrics = {}
+        for key, (getter, default) in getters.items():
+            if key in futures:
+                continue
+            try:
+                metrics[key] = getter()
+            except Exception as e:
+                logger.error(f"Failed to get {key}: {e!r}")
+                metrics[key] = default
+
+        wait(futures.values(), timeout=2.0)
+        for key, future in futures.items():
+            if not future.done():
+                logger.error(f"Timed out getting {key}")
+                continue
+            try:
+                metrics[key] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to get {key}: {e!r}")
+                metrics[key] = getters[key][1]
+
+        metrics["timestamp"] = datetime.now().isoformat()
+        metrics["platform"] = self._platform
+        metrics["hostname"] = self._hostname
+        return metrics
 
 
 class Agent:
     """XML-RPC Agent that serves metrics to the collector."""
 
-    def __init__(self, host: str = "0.0.0.0", port: int = 9000):
+    def __init__(self, host: str = "0.0.0.0", port: int = 9000, max_workers: int = 16):
         self.host = host
         self.port = port
-        self.metrics_collector = MetricsCollector()
+        self.max_workers = max_workers
+        self._platform = platform.system()
+        self._hostname = platform.node()
+        self.metrics_collector = MetricsCollector(max_requests=max_workers)
         self.server = None
         self._running = False
 
     def start(self):
         """Start the XML-RPC server."""
         try:
-            self.server = ThreadedXMLRPCServer((self.host, self.port))
+            self.server = ThreadedXMLRPCServer((self.host, self.port), max_workers=self.max_workers)
             self.server.register_instance(self)
             self.server.register_introspection_functions()
+            self.server.register_multicall_functions()
+            self.metrics_collector.start_cpu_sampler()
 
             logger.info(f"Agent started on {self.host}:{self.port}")
-            logger.info(f"Platform: {platform.system()} {platform.release()}")
+            logger.info(f"Platform: {self._platform} {platform.release()}")
 
             self._running = True
             self.server.serve_forever()
@@ -365,15 +760,16 @@ class Agent:
         if self.server:
             logger.info("Stopping agent...")
             self._running = False
+            self.metrics_collector.stop_cpu_sampler()
             self.server.shutdown()
             self.server.server_close()
             logger.info("Agent stopped")
 
     # XML-RPC exposed methods
 
-    def get_metrics(self) -> Dict[str, Any]:
-        """Get all system metrics (XML-RPC method)."""
-        return self.metrics_collector.get_all_metrics()
+    def get_metrics(self, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get system metrics, optionally only the named fields (XML-RPC method)."""
+        return self.metrics_collector.get_all_metrics(fields)
 
     def get_cpu_temperature(self) -> Optional[float]:
         """Get CPU temperature (XML-RPC method)."""
@@ -399,8 +795,8 @@ class Agent:
         """Get agent status."""
         return {
             "status": "running" if self._running else "stopped",
-            "platform": platform.system(),
-            "hostname": platform.node(),
+            "platform": self._platform,
+            "hostname": self._hostname,
             "timestamp": datetime.now().isoformat()
         }
 
@@ -412,6 +808,8 @@ def main():
     parser = argparse.ArgumentParser(description="Monitoring Agent")
     parser.add_argument("--host", default="0.0.0.0", help="Host to bind to")
     parser.add_argument("--port", type=int, default=9000, help="Port to listen on")
+    parser.add_argument("--max-workers", type=int, default=16,
+                        help="Maximum concurrent request handler threads")
     parser.add_argument("--log-level", default="INFO", 
                         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
                         help="Logging level")
@@ -421,7 +819,7 @@ def main():
     # Configure logging
     logging.getLogger().setLevel(getattr(logging, args.log_level))
 
-    agent = Agent(host=args.host, port=args.port)
+    agent = Agent(host=args.host, port=args.port, max_workers=args.max_workers)
 
     try:
         agent.start()
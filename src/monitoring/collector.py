@@ -6,179 +6,494 @@ Polls multiple agent systems via XML-RPC and collects metrics.
 import os
 import sys
 import time
+import asyncio
 import json
 import logging
+import functools
 import configparser
+import http.client
 import xmlrpc.client
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
-import queue
+from collections import deque
+from dataclasses import dataclass
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from src.monitoring.storage import create_storage, StorageBackend
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a metric payload to a JSON string, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=str)
+
+
+def _loads(data: bytes) -> Any:
+    """Parse a JSON response body, via orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_nonempty(obj: Any) -> Optional[str]:
+    """Like _dumps, but None for empty payloads so they are not stored."""
+    return _dumps(obj) if obj else None
+
+
+# (metric key, encoder) for every metric the storage schema knows, in store
+# order; values are stored as-is when the encoder is None
+_METRIC_HANDLERS = (
+    ("cpu_temperature", None),
+    ("cpu_usage", None),
+    ("system_load", _dumps),
+    ("security_threats", _dumps_nonempty),
+    ("memory", _dumps),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_timestamp(text: str) -> Optional[datetime]:
+    """Parse an agent's ISO timestamp; repeated strings hit the cache."""
+    try:
+        return datetime.fromisoformat(text)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass(frozen=True)
+class LoggingSettings:
+    """Logging options resolved from the [logging] and [general] sections."""
+    log_file: str
+    log_level: str
+    max_bytes: int
+    backup_count: int
+
+    @classmethod
+    def from_config(cls, config: configparser.ConfigParser) -> "LoggingSettings":
+        return cls(
+            log_file=config.get("logging", "log_file", fallback="/var/log/monitoring/collector.log"),
+            log_level=config.get("general", "log_level", fallback="INFO"),
+            max_bytes=int(config.get("logging", "max_log_size", fallback=10)) * 1024 * 1024,
+            backup_count=int(config.get("logging", "backup_count", fallback=5)),
+        )
+
+
+@dataclass(frozen=True)
+class StorageSettings:
+    """Storage backend options resolved from the [storage] and [mysql] sections."""
+    backend: str
+    mysql_host: str
+    mysql_port: int
+    mysql_user: str
+    mysql_password: str
+    mysql_database: str
+    data_dir: str
+
+    @classmethod
+    def from_config(cls, config: configparser.ConfigParser,
+                    log_file: str) -> "StorageSettings":
+        return cls(
+            backend=config.get("storage", "backend", fallback="log"),
+            mysql_host=config.get("mysql", "host", fallback="localhost"),
+            mysql_port=int(config.get("mysql", "port", fallback=3306)),
+            mysql_user=config.get("mysql", "user", fallback="monitor"),
+            mysql_password=config.get("mysql", "password", fallback="changeme"),
+            mysql_database=config.get("mysql", "database", fallback="monitoring"),
+            # Log-backend data lives next to the collector log
+            data_dir=f"{os.path.dirname(log_file) or '/var/log/monitoring'}/data",
+        )
+
+
+class KeepAliveTransport(xmlrpc.client.Transport):
+    """XML-RPC transport that reuses one persistent HTTP connection per agent."""
+
+    def __init__(self, timeout: float, *args, **kwargs):
+        kwargs.setdefault("headers", [("Connection", "keep-alive")])
+        super().__init__(*args, **kwargs)
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        if self._connection and host == self._connection[0]:
+            return self._connection[1]
+        chost, self._extra_headers, _ = self.get_host_info(host)
+        self._connection = host, http.client.HTTPConnection(chost, timeout=self.timeout)
+        return self._connection[1]
+
+    def getparser(self):
+        parser, unmarshaller = super().getparser()
+        # Deliver each text node in one callback instead of per input chunk
+        parser._parser.buffer_text = True
+        return parser, unmarshaller
+
+
+class JSONRPCProxy:
+    """JSON-RPC client for the agent's /rpc endpoint over one keep-alive connection.
+
+    Exposes agent methods like ServerProxy does and raises xmlrpc.client.Fault
+    and ProtocolError, so AgentConnection handles both encodings alike.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self._connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        self._url = f"http://{host}:{port}/rpc"
+        self._request_id = 0
+
+    def _call(self, method: str, params: tuple) -> Any:
+        self._request_id += 1
+        body = _dumps({"jsonrpc": "2.0", "method": method,
+                       "params": list(params), "id": self._request_id}).encode()
+        self._connection.request("POST", "/rpc", body, {
+            "Content-Type": "application/json", "Connection": "keep-alive"
+        })
+        response = self._connection.getresponse()
+        data = response.read()
+        if response.status != 200:
+            raise xmlrpc.client.ProtocolError(
+                self._url, response.status, response.reason, dict(response.getheaders())
+            )
+        reply = _loads(data)
+        error = reply.get("error")
+        if error:
+            raise xmlrpc.client.Fault(error.get("code", -32000), error.get("message", ""))
+        return reply.get("result")
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *params: self._call(name, params)
+
+    def close(self):
+        self._connection.close()
+
 
 class AgentConnection:
     """Manages connection to a single agent."""
 
-    def __init__(self, name: str, host: str, port: int, timeout: int = 10):
+    def __init__(self, name: str, host: str, port: int, timeout: int = 10,
+                 encoding: str = "xml"):
         self.name = name
         self.host = host
         self.port = port
         self.timeout = timeout
+        self.encoding = encoding
         self.proxy = None
+        self._stream: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
         self._last_success = None
         self._failure_count = 0
+        # Monotonic time before which a failing agent is not retried
+        self._next_retry = 0.0
+
+    def _backing_off(self) -> bool:
+        """Whether the agent is still inside its post-failure backoff window."""
+        return time.monotonic() < self._next_retry
+
+    def _record_success(self):
+        self._last_success = datetime.now()
+        self._failure_count = 0
+        self._next_retry = 0.0
+
+    def _record_failure(self):
+        """Count a failed poll and back off exponentially (2s, 4s, ... capped at 300s)."""
+        self._failure_count += 1
+        self._next_retry = time.monotonic() + min(300, 2 ** min(self._failure_count, 9))
 
     def connect(self) -> bool:
-        """Establish connection to the agent."""
+        """Set up the proxy; the TCP connection is opened by the first call."""
         try:
+            if self.encoding == "json":
+                self.proxy = JSONRPCProxy(self.host, self.port, self.timeout)
+                return True
             url = f"http://{self.host}:{self.port}"
-            self.proxy = xmlrpc.client.ServerProxy(url, allow_none=True)
-            # Test connection with ping
-            result = self.proxy.ping()
-            return result == "pong"
+            self.proxy = xmlrpc.client.ServerProxy(
+                url, transport=KeepAliveTransport(self.timeout), allow_none=True
+            )
+            return True
         except Exception as e:
-            logging.debug(f"Failed to connect to {self.name}: {e}")
+            logging.debug("Failed to connect to %s: %s", self.name, e)
             self.proxy = None
             return False
 
+    def close(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Close the keep-alive connection, and the asyncio stream on ``loop`` if given."""
+        if self.proxy is not None:
+            if isinstance(self.proxy, JSONRPCProxy):
+                self.proxy.close()
+            else:
+                self.proxy("close")()
+            self.proxy = None
+        if loop is not None:
+            loop.call_soon_threadsafe(self._close_stream)
+
     def is_connected(self) -> bool:
-        """Check if connection is active."""
+        """Health-check the agent with a ping (for admin tools, not the poll path)."""
         if self.proxy is None:
             return False
-        
+
         try:
-            self.proxy.ping()
-            return True
+            return self.proxy.ping() == "pong"
         except Exception:
             return False
 
-    def get_metrics(self) -> Optional[Dict[str, Any]]:
-        """Fetch metrics from the agent."""
-        if not self.is_connected():
-            if not self.connect():
-                self._failure_count += 1
-                return None
-
+    async def _post_aiohttp(self, session: "aiohttp.ClientSession", url: str, body: bytes) -> bytes:
+        """POST over a shared aiohttp session."""
+        async with session.post(
+            url,
+            data=body,
+            headers={"Content-Type": "text/xml"},
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        ) as response:
+            if response.status != 200:
+                raise xmlrpc.client.ProtocolError(
+                    url, response.status, response.reason, dict(response.headers)
+                )
+            return await response.read()
+
+    async def _post_stream(self, url: str, body: bytes) -> bytes:
+        """POST over this agent's persistent asyncio stream (selector/epoll driven)."""
+        if self._stream is None:
+            self._stream = await asyncio.open_connection(self.host, self.port)
+        reader, writer = self._stream
+        writer.write(
+            b"POST /RPC2 HTTP/1.1\r\nHost: %s:%d\r\nContent-Type: text/xml\r\n"
+            b"Content-Length: %d\r\nConnection: keep-alive\r\n\r\n"
+            % (self.host.encode("idna"), self.port, len(body)) + body
+        )
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by agent")
+        _, status, reason = (status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""])[:3]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        length = headers.get("content-length")
+        if length is None:
+            raise xmlrpc.client.ProtocolError(url, int(status), "response without Content-Length", headers)
+        data = await reader.readexactly(int(length))
+        if headers.get("connection", "").lower() == "close":
+            self._close_stream()
+        if status != "200":
+            raise xmlrpc.client.ProtocolError(url, int(status), reason, headers)
+        return data
+
+    def _close_stream(self):
+        """Drop the persistent asyncio stream, if any (call on the event loop)."""
+        if self._stream is not None:
+            self._stream[1].close()
+            self._stream = None
+
+    async def get_metrics_async(self, session: Optional["aiohttp.ClientSession"] = None) -> Optional[Dict[str, Any]]:
+        """Fetch metrics with a non-blocking XML-RPC POST on the running event loop.
+
+        Uses the shared aiohttp session when given, otherwise this agent's
+        own keep-alive asyncio stream.
+        """
+        if self._backing_off():
+            return None
+        url = f"http://{self.host}:{self.port}/RPC2"
+        body = xmlrpc.client.dumps((), "get_metrics", allow_none=True).encode()
         try:
-            metrics = self.proxy.get_metrics()
-            self._last_success = datetime.now()
-            self._failure_count = 0
+            if session is not None:
+                data = await self._post_aiohttp(session, url, body)
+            else:
+                # A reused stream may have been closed by the agent; retry once fresh
+                attempts = 2 if self._stream is not None else 1
+                for attempt in range(attempts):
+                    try:
+                        data = await asyncio.wait_for(self._post_stream(url, body), self.timeout)
+                        break
+                    except (ConnectionError, asyncio.IncompleteReadError):
+                        self._close_stream()
+                        if attempt + 1 == attempts:
+                            raise
+                    except BaseException:
+                        self._close_stream()
+                        raise
+            metrics = xmlrpc.client.loads(data)[0][0]
+            self._record_success()
             return metrics
         except xmlrpc.client.Fault as e:
-            logging.error(f"XML-RPC fault from {self.name}: {e}")
-            self._failure_count += 1
-            self.proxy = None
-            return None
+            logging.error("XML-RPC fault from %s: %s", self.name, e)
         except Exception as e:
-            logging.warning(f"Failed to get metrics from {self.name}: {e}")
-            self._failure_count += 1
-            self.proxy = None
+            logging.warning("Failed to get metrics from %s: %r", self.name, e)
+        self._record_failure()
+        return None
+
+    def get_metrics(self) -> Optional[Dict[str, Any]]:
+        """Fetch metrics from the agent, reconnecting only after a failed call."""
+        if self._backing_off():
             return None
 
+        # A proxy that was already in use may hold a stale keep-alive socket,
+        # so it gets one reconnect before the poll counts as failed
+        attempts = 2 if self.proxy is not None else 1
+        for attempt in range(attempts):
+            if self.proxy is None and not self.connect():
+                break
+            try:
+                metrics = self.proxy.get_metrics()
+                self._record_success()
+                return metrics
+            except xmlrpc.client.Fault as e:
+                logging.error("XML-RPC fault from %s: %s", self.name, e)
+                break
+            except TimeoutError as e:
+                logging.warning("Timed out getting metrics from %s: %s", self.name, e)
+                self.proxy = None
+                break
+            except (OSError, http.client.HTTPException, xmlrpc.client.ProtocolError) as e:
+                self.proxy = None
+                if attempt + 1 < attempts:
+                    continue
+                logging.warning("Failed to get metrics from %s: %s", self.name, e)
+            except Exception as e:
+                logging.warning("Failed to get metrics from %s: %s", self.name, e)
+                self.proxy = None
+                break
+
+        self._record_failure()
+        return None
+
 
 class ThresholdMonitor:
     """Monitors metrics against configurable thresholds."""
 
+    _THRESHOLDS = (
+        ("cpu_temp_warning", 70), ("cpu_temp_critical", 85),
+        ("load_warning", 2.0), ("load_critical", 4.0),
+        ("cpu_usage_warning", 80), ("cpu_usage_critical", 95),
+    )
+    # (metric, threshold prefix, message label, unit) in alert order
+    _CHECKS = (
+        ("cpu_temperature", "cpu_temp", "CPU temperature", "°C"),
+        ("system_load", "load", "System load", ""),
+        ("cpu_usage", "cpu_usage", "CPU usage", "%"),
+    )
+    # (severity, threshold vector, message template) per severity code
+    _SEVERITIES = (None, ("warning", "_warning", "%s high: %s%s"), ("critical", "_critical", "%s critical: %s%s"))
+    __slots__ = ("config", "_warning", "_critical") + tuple(name for name, _ in _THRESHOLDS)
+
     def __init__(self, config: configparser.ConfigParser):
         self.config = config
-        self.thresholds = {
-            "cpu_temp_warning": float(config.get("thresholds", "cpu_temp_warning", fallback=70)),
-            "cpu_temp_critical": float(config.get("thresholds", "cpu_temp_critical", fallback=85)),
-            "load_warning": float(config.get("thresholds", "load_warning", fallback=2.0)),
-            "load_critical": float(config.get("thresholds", "load_critical", fallback=4.0)),
-            "cpu_usage_warning": float(config.get("thresholds", "cpu_usage_warning", fallback=80)),
-            "cpu_usage_critical": float(config.get("thresholds", "cpu_usage_critical", fallback=95)),
-        }
+        # Plain slot attributes: check_metrics reads them without dict hashing
+        for name, default in self._THRESHOLDS:
+            setattr(self, name, float(config.get("thresholds", name, fallback=default)))
+        # Per-check threshold vectors, in _CHECKS order
+        self._warning = tuple(getattr(self, f"{prefix}_warning") for _, prefix, _, _ in self._CHECKS)
+        self._critical = tuple(getattr(self, f"{prefix}_critical") for _, prefix, _, _ in self._CHECKS)
+
+    @property
+    def thresholds(self) -> Dict[str, float]:
+        """All thresholds as a dict."""
+        return {name: getattr(self, name) for name, _ in self._THRESHOLDS}
+
+    @staticmethod
+    def _values(metrics: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+        """Checked values in _CHECKS order; temperature may be None."""
+        return (
+            metrics.get("cpu_temperature"),
+            metrics.get("system_load", {}).get("1min", 0),
+            metrics.get("cpu_usage", 0),
+        )
 
-    def check_metrics(self, metrics: Dict[str, Any], agent_name: str) -> List[Dict[str, Any]]:
-        """Check metrics against thresholds and return alerts."""
+    @staticmethod
+    def _alert(agent_name: str, type_: str, severity: str, value: Any,
+               threshold: Optional[float], message: str) -> Dict[str, Any]:
+        """Build one alert dict."""
+        alert = {"agent": agent_name, "type": type_, "severity": severity, "value": value}
+        if threshold is not None:
+            alert["threshold"] = threshold
+        alert["message"] = message
+        return alert
+
+    def _alerts(self, agent_name: str, values, codes, threats) -> List[Dict[str, Any]]:
+        """Build alert dicts from per-check severity codes (0 ok, 1 warning, 2 critical)."""
         alerts = []
-
-        # Check CPU temperature
-        temp = metrics.get("cpu_temperature")
-        if temp is not None:
-            if temp >= self.thresholds["cpu_temp_critical"]:
-                alerts.append({
-                    "agent": agent_name,
-                    "type": "cpu_temperature",
-                    "severity": "critical",
-                    "value": temp,
-                    "threshold": self.thresholds["cpu_temp_critical"],
-                    "message": f"CPU temperature critical: {temp}°C"
-                })
-            elif temp >= self.thresholds["cpu_temp_warning"]:
-                alerts.append({
-                    "agent": agent_name,
-                    "type": "cpu_temperature",
-                    "severity": "warning",
-                    "value": temp,
-                    "threshold": self.thresholds["cpu_temp_warning"],
-                    "message": f"CPU temperature high: {temp}°C"
-                })
-
-        # Check system load (1min)
-        load = metrics.get("system_load", {}).get("1min", 0)
-        num_cpus = metrics.get("cpu_usage", 1)  # Approximate
-        
-        if load >= self.thresholds["load_critical"]:
-            alerts.append({
-                "agent": agent_name,
-                "type": "system_load",
-                "severity": "critical",
-                "value": load,
-                "threshold": self.thresholds["load_critical"],
-                "message": f"System load critical: {load}"
-            })
-        elif load >= self.thresholds["load_warning"]:
-            alerts.append({
-                "agent": agent_name,
-                "type": "system_load",
-                "severity": "warning",
-                "value": load,
-                "threshold": self.thresholds["load_warning"],
-                "message": f"System load high: {load}"
-            })
-
-        # Check CPU usage
-        cpu_usage = metrics.get("cpu_usage", 0)
-        if cpu_usage >= self.thresholds["cpu_usage_critical"]:
-            alerts.append({
-                "agent": agent_name,
-                "type": "cpu_usage",
-                "severity": "critical",
-                "value": cpu_usage,
-                "threshold": self.thresholds["cpu_usage_critical"],
-                "message": f"CPU usage critical: {cpu_usage}%"
-            })
-        elif cpu_usage >= self.thresholds["cpu_usage_warning"]:
-            alerts.append({
-                "agent": agent_name,
-                "type": "cpu_usage",
-                "severity": "warning",
-                "value": cpu_usage,
-                "threshold": self.thresholds["cpu_usage_warning"],
-                "message": f"CPU usage high: {cpu_usage}%"
-            })
+        for i, code in enumerate(codes):
+            if not code:
+                continue
+            metric, _, label, unit = self._CHECKS[i]
+            severity, vector, template = self._SEVERITIES[code]
+            value = values[i]
+            alerts.append(self._alert(agent_name, metric, severity, value,
+                                      getattr(self, vector)[i], template % (label, value, unit)))
 
         # Check security threats
-        threats = metrics.get("security_threats", [])
-        for threat in threats:
-            alerts.append({
-                "agent": agent_name,
-                "type": "security_threat",
-                "severity": threat.get("severity", "unknown"),
-                "value": threat,
-                "message": f"Security threat: {threat.get('description', 'Unknown')}"
-            })
+        for threat in threats or ():
+            alerts.append(self._alert(
+                agent_name, "security_threat", threat.get("severity", "unknown"), threat, None,
+                "Security threat: %s" % threat.get("description", "Unknown")
+            ))
 
         return alerts
 
+    def check_batch(self, metrics_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Check a whole poll cycle, keyed by each dict's _agent_name.
+
+        With NumPy, the severity codes for every agent and metric come from
+        two vectorized comparisons over an (agents x checks) array; only rows
+        with a nonzero code or security threats are turned into alert dicts.
+        """
+        if np is None or not metrics_list:
+            alerts = []
+            for metrics in metrics_list:
+                alerts.extend(self.check_metrics(metrics, metrics.get("_agent_name", "unknown")))
+            return alerts
+
+        rows = [self._values(m) for m in metrics_list]
+        values = np.array(
+            [(-np.inf if temp is None else temp, load, usage) for temp, load, usage in rows],
+            dtype=np.float64,
+        )
+        codes = np.where(values >= self._critical, 2,
+                         np.where(values >= self._warning, 1, 0)).astype(np.int8)
+
+        alerts = []
+        for metrics, row, row_codes, hit in zip(metrics_list, rows, codes.tolist(),
+                                                codes.any(axis=1).tolist()):
+            threats = metrics.get("security_threats")
+            if hit or threats:
+                alerts.extend(self._alerts(metrics.get("_agent_name", "unknown"),
+                                           row, row_codes, threats))
+        return alerts
+
+    def check_metrics(self, metrics: Dict[str, Any], agent_name: str) -> List[Dict[str, Any]]:
+        """Check metrics against thresholds and return alerts."""
+        values = self._values(metrics)
+        codes = [
+            0 if value is None else
+            2 if value >= critical else
+            1 if value >= warning else 0
+            for value, warning, critical in zip(values, self._warning, self._critical)
+        ]
+        return self._alerts(agent_name, values, codes, metrics.get("security_threats", []))
+
 
 class Collector:
     """Main collector that polls multiple agents and stores metrics."""
@@ -186,6 +501,13 @@ class Collector:
     def __init__(self, config_path: str = "config/config.ini"):
         self.config_path = config_path
         self.config = self._load_config()
+        self._config_lock = threading.Lock()
+
+        # Resolve config once; the polling loop only reads these attributes
+        self.log_cfg = LoggingSettings.from_config(self.config)
+        self.backend_cfg = StorageSettings.from_config(self.config, self.log_cfg.log_file)
+        self.poll_interval = int(self.config.get("general", "poll_interval", fallback=10))
+        self.async_poll = self.config.getboolean("general", "async_poll", fallback=False)
         
         # Set up logging
         self._setup_logging()
@@ -197,16 +519,66 @@ class Collector:
         # Agent management
         self.agents: Dict[str, AgentConnection] = {}
         self._load_agents()
+
+        # Long-lived polling pool, reused across cycles
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(4, len(self.agents)), thread_name_prefix="poll"
+        )
+
+        # Optional asyncio polling on a persistent event loop thread: one
+        # selector (epoll) thread multiplexes every agent's socket
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session = None
+        # Connections replaced by reload_config, closed between poll cycles
+        self._retired_agents: List[AgentConnection] = []
+        if self.async_poll:
+            self._start_async_loop()
         
         # Control flags
         self._running = False
         self._stop_event = threading.Event()
         
-        # Metrics queue for thread-safe processing
-        self._metrics_queue = queue.Queue()
-        
-        # Polling settings
-        self.poll_interval = int(self.config.get("general", "poll_interval", fallback=10))
+        # Poll cycles waiting for the storage writer; deque append/popleft are
+        # atomic, so the single producer and consumer need no lock
+        self._metrics_queue: deque = deque(maxlen=10000)
+        self._metrics_ready = threading.Event()
+        # Poll cycles evicted because the writer fell a full queue behind
+        self.dropped_cycles = 0
+        self._writer: Optional[threading.Thread] = None
+
+    def _start_async_loop(self):
+        """Run an event loop in a daemon thread, with a pooled aiohttp session if available.
+
+        Without aiohttp each agent keeps its own keep-alive asyncio stream.
+        """
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="poll-async", daemon=True).start()
+        if aiohttp is None:
+            logging.info("aiohttp not installed; async polling uses asyncio streams")
+            return
+
+        async def make_session():
+            return aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=0, keepalive_timeout=300)
+            )
+
+        self._session = asyncio.run_coroutine_threadsafe(make_session(), self._loop).result()
+
+    def _stop_async_loop(self):
+        """Close the aiohttp session or agent streams and stop the event loop thread."""
+        if self._loop is None:
+            return
+
+        async def close():
+            if self._session is not None:
+                await self._session.close()
+            for agent in self.agents.values():
+                agent._close_stream()
+
+        asyncio.run_coroutine_threadsafe(close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+        self._session = None
 
     def _load_config(self) -> configparser.ConfigParser:
         """Load configuration from file."""
@@ -223,12 +595,70 @@ class Collector:
                 raise FileNotFoundError(f"Config file not found: {self.config_path}")
         return config
 
+    def reload_config(self, config_path: Optional[str] = None):
+        """Re-read the config file and apply thresholds, poll interval, agents and async_poll.
+
+        Storage and logging settings take effect on restart. Replaced agent
+        connections, the async loop and the poll pool are switched over by
+        the polling loop between cycles, so an in-flight poll is not cut off.
+        """
+        with self._config_lock:
+            if config_path:
+                self.config_path = config_path
+            self.config = self._load_config()
+            self.threshold_monitor = ThresholdMonitor(self.config)
+            self.poll_interval = int(self.config.get("general", "poll_interval", fallback=10))
+            self.async_poll = self.config.getboolean("general", "async_poll", fallback=False)
+
+            agents: Dict[str, AgentConnection] = {}
+            self._load_agents(agents)
+            for name, agent in agents.items():
+                old = self.agents.get(name)
+                # Keep live connections for agents whose address is unchanged
+                if old is not None and (old.host, old.port, old.encoding) == (agent.host, agent.port, agent.encoding):
+                    agents[name] = old
+            kept = {id(agent) for agent in agents.values()}
+            self._retired_agents.extend(a for a in self.agents.values() if id(a) not in kept)
+            # Swap in one assignment so a running poll sees old or new, never partial
+            self.agents = agents
+            logging.info("Reloaded config from %s", self.config_path)
+        if not self._running:
+            self._apply_reload()
+
+    def _apply_reload(self):
+        """Close retired agent connections and match the async loop and poll pool to the config.
+
+        Called between poll cycles, when no poll is using them.
+        """
+        with self._config_lock:
+            retired, self._retired_agents = self._retired_agents, []
+            for agent in retired:
+                try:
+                    agent.close(self._loop)
+                except Exception as e:
+                    logging.debug("Error closing connection to %s: %s", agent.name, e)
+
+            if self.async_poll and self._loop is None:
+                self._start_async_loop()
+                logging.info("Async polling enabled")
+            elif not self.async_poll and self._loop is not None:
+                self._stop_async_loop()
+                logging.info("Async polling disabled")
+
+            workers = max(4, len(self.agents))
+            if workers != self._executor._max_workers:
+                old, self._executor = self._executor, ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="poll"
+                )
+                old.shutdown(wait=False)
+                logging.info("Resized poll pool to %d workers", workers)
+
     def _setup_logging(self):
         """Configure logging with file rotation."""
-        log_file = self.config.get("logging", "log_file", fallback="/var/log/monitoring/collector.log")
-        log_level = self.config.get("general", "log_level", fallback="INFO")
-        max_size = int(self.config.get("logging", "max_log_size", fallback=10)) * 1024 * 1024
-        backup_count = int(self.config.get("logging", "backup_count", fallback=5))
+        log_file = self.log_cfg.log_file
+        log_level = self.log_cfg.log_level
+        max_size = self.log_cfg.max_bytes
+        backup_count = self.log_cfg.backup_count
 
         # Ensure log directory exists
         log_dir = os.path.dirname(log_file)
@@ -260,26 +690,29 @@ class Collector:
 
     def _init_storage(self) -> StorageBackend:
         """Initialize storage backend."""
-        backend = self.config.get("storage", "backend", fallback="log")
+        cfg = self.backend_cfg
         
-        if backend == "mysql":
+        if cfg.backend == "mysql":
             return create_storage(
                 "mysql",
-                host=self.config.get("mysql", "host", fallback="localhost"),
-                port=int(self.config.get("mysql", "port", fallback=3306)),
-                user=self.config.get("mysql", "user", fallback="monitor"),
-                password=self.config.get("mysql", "password", fallback="changeme"),
-                database=self.config.get("mysql", "database", fallback="monitoring")
+                host=cfg.mysql_host,
+                port=cfg.mysql_port,
+                user=cfg.mysql_user,
+                password=cfg.mysql_password,
+                database=cfg.mysql_database
             )
-        elif backend == "sqlite":
+        elif cfg.backend == "sqlite":
             return create_storage("sqlite", db_path="/var/log/monitoring/metrics.db")
+        elif cfg.backend == "columnar":
+            return create_storage("columnar", data_dir=cfg.data_dir)
         else:
-            log_dir = self.config.get("logging", "log_file", fallback="/var/log/monitoring/collector.log")
-            log_dir = os.path.dirname(log_file) if log_dir else "/var/log/monitoring"
-            return create_storage("log", log_dir=f"{log_dir}/data")
+            return create_storage("log", log_dir=cfg.data_dir)
 
-    def _load_agents(self):
-        """Load agents from configuration."""
+    def _load_agents(self, agents: Optional[Dict[str, "AgentConnection"]] = None):
+        """Load agents from configuration into agents (default: self.agents)."""
+        if agents is None:
+            agents = self.agents
+        self.rpc_encoding = self.config.get("general", "rpc_encoding", fallback="xml")
         if self.config.has_section("agents"):
             for name, address in self.config.items("agents"):
                 if "=" in name:
@@ -291,21 +724,23 @@ class Collector:
                     host, port = address.rsplit(":", 1)
                     try:
                         port = int(port)
-                        self.agents[name] = AgentConnection(name, host, port)
-                        logging.info(f"Loaded agent: {name} at {host}:{port}")
+                        agents[name] = AgentConnection(
+                            name, host, port, encoding=self.rpc_encoding
+                        )
+                        logging.info("Loaded agent: %s at %s:%s", name, host, port)
                     except ValueError:
-                        logging.error(f"Invalid port for agent {name}: {address}")
+                        logging.error("Invalid port for agent %s: %s", name, address)
 
     def add_agent(self, name: str, host: str, port: int):
         """Add a new agent to monitor."""
-        self.agents[name] = AgentConnection(name, host, port)
-        logging.info(f"Added agent: {name} at {host}:{port}")
+        self.agents[name] = AgentConnection(name, host, port, encoding=self.rpc_encoding)
+        logging.info("Added agent: %s at %s:%s", name, host, port)
 
     def remove_agent(self, name: str):
         """Remove an agent from monitoring."""
         if name in self.agents:
             del self.agents[name]
-            logging.info(f"Removed agent: {name}")
+            logging.info("Removed agent: %s", name)
 
     def poll_agent(self, name: str) -> Optional[Dict[str, Any]]:
         """Poll a single agent for metrics."""
@@ -319,109 +754,180 @@ class Collector:
             return metrics
         return None
 
+    async def poll_agent_async(self, name: str) -> Optional[Dict[str, Any]]:
+        """Poll a single agent for metrics on the event loop."""
+        agent = self.agents.get(name)
+        if not agent:
+            return None
+
+        metrics = await agent.get_metrics_async(self._session)
+        if metrics:
+            metrics["_agent_name"] = name
+            return metrics
+        return None
+
+    async def _poll_endpoints_async(self, groups: List[List[str]]) -> List[Tuple[List[str], Any]]:
+        """Poll every endpoint group concurrently with asyncio.gather."""
+        results = await asyncio.gather(
+            *(self.poll_agent_async(names[0]) for names in groups),
+            return_exceptions=True,
+        )
+        return list(zip(groups, results))
+
+    def _poll_endpoints(self, groups: List[List[str]]):
+        """Yield (names, metrics) per endpoint group as polls complete."""
+        if self._loop is not None:
+            yield from asyncio.run_coroutine_threadsafe(
+                self._poll_endpoints_async(groups), self._loop
+            ).result()
+            return
+
+        future_to_agents = {
+            self._executor.submit(self.poll_agent, names[0]): names
+            for names in groups
+        }
+        for future in as_completed(future_to_agents):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = e
+            yield future_to_agents[future], result
+
     def poll_all_agents(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """Poll all agents concurrently."""
         all_metrics = []
         all_alerts = []
 
-        with ThreadPoolExecutor(max_workers=len(self.agents)) as executor:
-            future_to_agent = {
-                executor.submit(self.poll_agent, name): name 
-                for name in self.agents
-            }
-
-            for future in as_completed(future_to_agent):
-                agent_name = future_to_agent[future]
-                try:
-                    metrics = future.result()
-                    if metrics:
-                        all_metrics.append(metrics)
-                        
-                        # Check thresholds
-                        alerts = self.threshold_monitor.check_metrics(metrics, agent_name)
-                        all_alerts.extend(alerts)
-                        
-                        if alerts:
-                            for alert in alerts:
-                                logging.warning(f"Alert: {alert['message']}")
-                except Exception as e:
-                    logging.error(f"Error polling agent {agent_name}: {e}")
+        # Agents configured under several names at one endpoint share a single
+        # round-trip per cycle; only distinct endpoints are polled in parallel
+        endpoints: Dict[Tuple[str, int], List[str]] = {}
+        for name, agent in self.agents.items():
+            endpoints.setdefault((agent.host, agent.port), []).append(name)
+        if not endpoints:
+            return all_metrics, all_alerts
+
+        for names, metrics in self._poll_endpoints(list(endpoints.values())):
+            if isinstance(metrics, Exception):
+                logging.error("Error polling agent %s: %s", names[0], metrics)
+                continue
+            if not metrics:
+                continue
+            for agent_name in names:
+                if agent_name != names[0]:
+                    metrics = dict(metrics, _agent_name=agent_name)
+                all_metrics.append(metrics)
+
+        # Check thresholds for the whole cycle at once
+        all_alerts = self.threshold_monitor.check_batch(all_metrics)
+        for alert in all_alerts:
+            logging.warning("Alert: %s", alert["message"])
 
         return all_metrics, all_alerts
 
     def store_metrics(self, metrics_list: List[Dict[str, Any]]):
         """Store metrics to the configured storage backend."""
+        rows = []
         for metrics in metrics_list:
-            agent_name = metrics.pop("_agent_name", "unknown")
-            timestamp = metrics.pop("timestamp", None)
-            
-            if timestamp:
-                try:
-                    timestamp = datetime.fromisoformat(timestamp)
-                except (ValueError, TypeError):
-                    timestamp = None
-
-            # Store each metric type separately
-            if "cpu_temperature" in metrics:
-                temp = metrics["cpu_temperature"]
-                if temp is not None:
-                    self.storage.save_metric(
-                        agent_name, "cpu_temperature", temp, timestamp
-                    )
-
-            if "cpu_usage" in metrics:
-                self.storage.save_metric(
-                    agent_name, "cpu_usage", metrics["cpu_usage"], timestamp
-                )
-
-            if "system_load" in metrics:
-                self.storage.save_metric(
-                    agent_name, "system_load", 
-                    json.dumps(metrics["system_load"]), timestamp
-                )
-
-            if "security_threats" in metrics:
-                threats = metrics["security_threats"]
-                if threats:
-                    self.storage.save_metric(
-                        agent_name, "security_threats",
-                        json.dumps(threats), timestamp
-                    )
-
-            if "memory" in metrics:
-                self.storage.save_metric(
-                    agent_name, "memory",
-                    json.dumps(metrics["memory"]), timestamp
+            agent_name = metrics.get("_agent_name", "unknown")
+            timestamp = metrics.get("timestamp")
+            timestamp = _parse_timestamp(timestamp) if isinstance(timestamp, str) else None
+
+            # Store each known metric type separately
+            for key, encode in _METRIC_HANDLERS:
+                value = metrics.get(key)
+                if value is None:
+                    continue
+                if encode is not None:
+                    value = encode(value)
+                    if value is None:
+                        continue
+                rows.append((agent_name, key, value, timestamp))
+
+        # One batched write for the whole cycle
+        if rows:
+            self.storage.save_metrics_bulk(rows)
+
+    def _enqueue_metrics(self, metrics_list: List[Dict[str, Any]]):
+        """Queue a poll cycle for the writer, evicting (and reporting) the oldest when full."""
+        if len(self._metrics_queue) >= self._metrics_queue.maxlen:
+            try:
+                evicted = self._metrics_queue.popleft()
+            except IndexError:
+                evicted = None  # the writer drained it meanwhile
+            if evicted is not None:
+                self.dropped_cycles += 1
+                logging.warning(
+                    "Storage writer is %d poll cycles behind; dropped the oldest "
+                    "(%d agent(s), %d cycle(s) dropped so far)",
+                    self._metrics_queue.maxlen, len(evicted), self.dropped_cycles
                 )
+        self._metrics_queue.append(metrics_list)
+        self._metrics_ready.set()
+
+    def _store_loop(self):
+        """Storage writer: drain queued poll cycles whenever the poller signals."""
+        while True:
+            self._metrics_ready.wait()
+            # Clear before draining so an append during the drain re-arms the event
+            self._metrics_ready.clear()
+            # Coalesce every queued cycle into one bulk write, so a backlog
+            # built up behind a slow write is caught up in one transaction
+            metrics_list = []
+            while True:
+                try:
+                    metrics_list.extend(self._metrics_queue.popleft())
+                except IndexError:
+                    break
+            if metrics_list:
+                try:
+                    self.store_metrics(metrics_list)
+                except Exception as e:
+                    logging.error("Error storing metrics: %s", e)
+            if self._stop_event.is_set():
+                return
 
     def start(self):
         """Start the collector polling loop."""
         self._running = True
+        self._writer = threading.Thread(target=self._store_loop, name="store", daemon=True)
+        self._writer.start()
         logging.info("Collector started")
-        logging.info(f"Monitoring {len(self.agents)} agent(s)")
+        logging.info("Monitoring %d agent(s)", len(self.agents))
 
+        # Cycles start on a fixed grid (start + k * poll_interval) so the
+        # polling work does not add to the period
+        next_deadline = time.monotonic()
         while not self._stop_event.is_set():
             try:
+                # Switch over anything reload_config changed since the last cycle
+                self._apply_reload()
+
                 # Poll all agents
                 metrics_list, alerts = self.poll_all_agents()
                 
-                # Store metrics
+                # Hand the cycle to the storage writer
                 if metrics_list:
-                    self.store_metrics(metrics_list)
-                    logging.debug(f"Collected metrics from {len(metrics_list)} agent(s)")
+                    self._enqueue_metrics(metrics_list)
+                    logging.debug("Collected metrics from %d agent(s)", len(metrics_list))
                 
                 # Log alerts
                 for alert in alerts:
                     if alert["severity"] in ["critical", "warning"]:
                         log_func = logging.warning if alert["severity"] == "warning" else logging.error
-                        log_func(f"ALERT [{alert['severity']}]: {alert['message']}")
+                        log_func("ALERT [%s]: %s", alert['severity'], alert['message'])
                 
-                # Wait for next poll interval
-                self._stop_event.wait(timeout=self.poll_interval)
-
             except Exception as e:
-                logging.error(f"Error in collector loop: {e}")
-                self._stop_event.wait(timeout=self.poll_interval)
+                logging.error("Error in collector loop: %s", e)
+
+            # Wait for the next slot; after an overrun, skip ahead instead of
+            # firing the missed cycles back to back
+            next_deadline += self.poll_interval
+            delay = next_deadline - time.monotonic()
+            if delay < 0:
+                logging.warning("Poll cycle overran the %ss interval by %.1fs",
+                                self.poll_interval, -delay)
+                next_deadline = time.monotonic()
+            self._stop_event.wait(timeout=max(0.0, delay))
 
         logging.info("Collector stopped")
 
@@ -429,6 +935,16 @@ class Collector:
         """Stop the collector."""
         self._stop_event.set()
         self._running = False
+        # Let the writer flush what is queued, then exit
+        self._metrics_ready.set()
+        if self._writer is not None:
+            self._writer.join(timeout=30)
+            self._writer = None
+        self._executor.shutdown(wait=True)
+        for agent in self._retired_agents + list(self.agents.values()):
+            agent.close(self._loop)
+        self._retired_agents = []
+        self._stop_async_loop()
         logging.info("Stopping collector...")
 
     def get_storage(self) -> StorageBackend:
@@ -464,7 +980,7 @@ def main():
         logging.info("Received interrupt signal")
         collector.stop()
     except Exception as e:
-        logging.error(f"Collector error: {e}")
+        logging.error("Collector error: %s", e)
         sys.exit(1)
 
 
@@ -1,17 +1,87 @@
 """
 Storage abstraction layer for the monitoring system.
-Supports both file-based logging and MySQL database storage.
+Supports file-based logging, compressed columnar files, and MySQL/SQLite
+database storage.
 """
 
 import os
 import json
+import atexit
+import struct
+import queue
 import logging
 import sqlite3
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+from urllib.parse import quote, unquote
 import threading
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from dbutils.pooled_db import PooledDB
+except ImportError:
+    PooledDB = None
+
+
+def _dumps_line(obj: Dict[str, Any]) -> bytes:
+    """Serialize one record as a newline-terminated JSON line; datetimes become ISO strings."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str,
+                            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(obj, default=_isoformat) + "\n").encode("utf-8")
+
+
+def _isoformat(obj: Any) -> str:
+    """json.dumps default hook: ISO strings for datetimes, str() otherwise."""
+    return obj.isoformat() if isinstance(obj, datetime) else str(obj)
+
+
+def _drain(q: "queue.SimpleQueue | queue.Queue") -> List[Any]:
+    """Take every item currently in a queue without blocking."""
+    items = []
+    try:
+        while True:
+            items.append(q.get_nowait())
+    except queue.Empty:
+        return items
+
+
+def _split_value(value: Any) -> Tuple[Optional[float], Optional[str]]:
+    """Split a metric value into the (value_num, value_text) SQL columns."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value), None
+    return None, str(value)
+
+
+def _as_real(text: Optional[str]) -> Optional[float]:
+    """float(text), or None when the text is not a number."""
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def _loads(line) -> Any:
+    """Parse one JSON line, via orjson when available."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+# ColumnarStorage timestamps: integer microseconds since a naive epoch, so
+# naive local datetimes round-trip exactly
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_FLOAT = struct.Struct("<d")
+_BITS = struct.Struct("<Q")
 
 
 class StorageBackend(ABC):
@@ -23,6 +93,17 @@ class StorageBackend(ABC):
         """Save a metric to storage."""
         pass
 
+    def save_metrics_bulk(self, rows: Iterable[Tuple[str, str, Any, Optional[datetime]]]) -> bool:
+        """Save many (agent_name, metric_type, value, timestamp) rows at once.
+
+        Backends override this with a single batched write; the default
+        falls back to one save_metric call per row.
+        """
+        ok = True
+        for agent_name, metric_type, value, timestamp in rows:
+            ok = self.save_metric(agent_name, metric_type, value, timestamp) and ok
+        return ok
+
     @abstractmethod
     def get_metrics(self, agent_name: str, metric_type: Optional[str] = None,
                     start_time: Optional[datetime] = None,
@@ -42,9 +123,10 @@ class StorageBackend(ABC):
 
 
 class LogStorage(StorageBackend):
-    """File-based storage using JSON lines with rotation support."""
+    """File-based storage using JSON lines, partitioned into one file per day."""
 
-    def __init__(self, log_dir: str = None):
+    def __init__(self, log_dir: str = None, flush_interval: float = 1.0,
+                 flush_lines: int = 1 << 13):
         # Use fallback path if /var/log is not writable
         if log_dir is None:
             log_dir = os.environ.get('MONITORING_DATA_DIR')
@@ -71,85 +153,241 @@ class LogStorage(StorageBackend):
             self.log_dir.mkdir(parents=True, exist_ok=True)
             logging.warning(f"Using fallback data directory: {self.log_dir}")
         
+        # Pre-partitioning single file (and its numbered backups), read only
         self.log_file = self.log_dir / "metrics.jsonl"
-        self._lock = threading.Lock()
+        # _write_lock serializes file access
+        self._write_lock = threading.Lock()
+
+        # (day, line) pairs are queued in memory and appended by a background
+        # flusher in one write per partition, through a handle kept open on
+        # the newest day's file. SimpleQueue puts never contend on a Python
+        # lock, so producers don't serialize on each other.
+        self._q: "queue.SimpleQueue[Tuple[date, bytes]]" = queue.SimpleQueue()
+        self._flush_interval = flush_interval
+        self._flush_lines = flush_lines
+        self._fp = None
+        self._fp_day: Optional[date] = None
+
+        # Known agents, persisted one per line in a sidecar file so
+        # get_agents never has to scan the data files
+        self._agents_file = self.log_dir / "agents.txt"
+        self._agents_lock = threading.Lock()
+        self._agents = self._load_agents()
+
+        self._closed = False
+        self._wake = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="log-storage-flush",
+                                         daemon=True)
+        self._flusher.start()
+        atexit.register(self.flush)
+
+    def _load_agents(self) -> set:
+        """Read the agents sidecar, building it with one scan of the data files if missing."""
+        if self._agents_file.exists():
+            with open(self._agents_file, "r") as f:
+                return {line.strip() for line in f if line.strip()}
+
+        agents = set()
+        for path in self._data_files():
+            try:
+                with open(path, "rb") as f:
+                    for line in f:
+                        try:
+                            agent = _loads(line).get("agent")
+                        except ValueError:
+                            continue
+                        if agent is not None:
+                            agents.add(agent)
+            except OSError as e:
+                logging.error(f"Failed to scan agents from {path}: {e}")
+        try:
+            with open(self._agents_file, "w") as f:
+                f.writelines(f"{agent}\n" for agent in sorted(agents))
+        except OSError as e:
+            logging.error(f"Failed to write agents file: {e}")
+        return agents
+
+    def _remember_agent(self, agent_name: str):
+        """Record a new agent in memory and in the sidecar file."""
+        if agent_name in self._agents:
+            return
+        with self._agents_lock:
+            if agent_name in self._agents:
+                return
+            self._agents.add(agent_name)
+            try:
+                with open(self._agents_file, "a") as f:
+                    f.write(f"{agent_name}\n")
+            except OSError as e:
+                logging.error(f"Failed to update agents file: {e}")
+
+    def _append(self, lines: List[Tuple[date, bytes]]):
+        """Queue (day, line) pairs; wake the flusher once enough lines are pending."""
+        for item in lines:
+            self._q.put_nowait(item)
+        if self._q.qsize() >= self._flush_lines:
+            self._wake.set()
+
+    def _flush_loop(self):
+        """Flush the buffer every flush_interval, or sooner when it fills up."""
+        while not self._closed:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write all buffered lines, one write per daily partition."""
+        with self._write_lock:
+            batch = _drain(self._q)
+            if not batch:
+                return
+
+            by_day: Dict[date, List[bytes]] = {}
+            for day, line in batch:
+                by_day.setdefault(day, []).append(line)
+            for day, lines in by_day.items():
+                try:
+                    data = b"".join(lines)
+                    if self._fp_day is None or day >= self._fp_day:
+                        # Today's (or a newer) partition: keep its handle open
+                        if day != self._fp_day:
+                            if self._fp is not None:
+                                self._fp.close()
+                            self._fp = open(self._partition(day), "ab", buffering=1 << 20)
+                            self._fp_day = day
+                        self._fp.write(data)
+                        self._fp.flush()
+                    else:
+                        # Late data for an older day
+                        with open(self._partition(day), "ab") as f:
+                            f.write(data)
+                except Exception as e:
+                    logging.error(f"Failed to save metrics to log: {e}")
+
+    def _partition(self, day: date) -> Path:
+        """Data file holding the given day's metrics."""
+        return self.log_dir / f"metrics-{day:%Y-%m-%d}.jsonl"
+
+    def _data_files(self, start_time: Optional[datetime] = None,
+                    end_time: Optional[datetime] = None) -> List[Path]:
+        """Existing data files that may hold entries in [start_time, end_time], oldest first.
+
+        Daily partitions outside the range are pruned; the legacy single file
+        and its backups cannot be, so they are always included.
+        """
+        legacy = sorted(self.log_dir.glob("metrics.jsonl.*"),
+                        key=lambda p: -int(p.suffix[1:]) if p.suffix[1:].isdigit() else 0)
+        if self.log_file.exists():
+            legacy.append(self.log_file)
+
+        first = start_time.date() if start_time else None
+        last = end_time.date() if end_time else None
+        partitions = []
+        for path in sorted(self.log_dir.glob("metrics-????-??-??.jsonl")):
+            try:
+                day = date.fromisoformat(path.stem[len("metrics-"):])
+            except ValueError:
+                continue
+            if (first and day < first) or (last and day > last):
+                continue
+            partitions.append(path)
+        return legacy + partitions
 
     def save_metric(self, agent_name: str, metric_type: str, value: Any,
                     timestamp: Optional[datetime] = None, metadata: Optional[Dict] = None) -> bool:
         """Save metric to JSONL file."""
-        with self._lock:
-            try:
-                entry = {
-                    "timestamp": (timestamp or datetime.now()).isoformat(),
+        try:
+            timestamp = timestamp or datetime.now()
+            entry = {
+                "timestamp": timestamp,
+                "agent": agent_name,
+                "metric_type": metric_type,
+                "value": value,
+                "metadata": metadata or {}
+            }
+            self._append([(timestamp.date(), _dumps_line(entry))])
+            self._remember_agent(agent_name)
+            return True
+        except Exception as e:
+            logging.error(f"Failed to save metric to log: {e}")
+            return False
+
+    def save_metrics_bulk(self, rows: Iterable[Tuple[str, str, Any, Optional[datetime]]]) -> bool:
+        """Append all rows to the JSONL partitions in one write per day."""
+        now = datetime.now()
+        rows = list(rows)
+        try:
+            for agent_name in {row[0] for row in rows}:
+                self._remember_agent(agent_name)
+            self._append([
+                ((timestamp or now).date(), _dumps_line({
+                    "timestamp": timestamp or now,
                     "agent": agent_name,
                     "metric_type": metric_type,
                     "value": value,
-                    "metadata": metadata or {}
-                }
-                with open(self.log_file, "a") as f:
-                    f.write(json.dumps(entry) + "\n")
-                return True
-            except Exception as e:
-                logging.error(f"Failed to save metric to log: {e}")
-                return False
+                    "metadata": {}
+                }))
+                for agent_name, metric_type, value, timestamp in rows
+            ])
+            return True
+        except Exception as e:
+            logging.error(f"Failed to save metrics to log: {e}")
+            return False
 
     def get_metrics(self, agent_name: str, metric_type: Optional[str] = None,
                     start_time: Optional[datetime] = None,
                     end_time: Optional[datetime] = None) -> List[Dict]:
         """Retrieve metrics from JSONL file."""
         results = []
-        if not self.log_file.exists():
-            return results
+        self.flush()
 
-        with self._lock:
+        with self._write_lock:
             try:
-                with open(self.log_file, "r") as f:
-                    for line in f:
-                        try:
-                            entry = json.loads(line.strip())
-                            if entry.get("agent") != agent_name:
-                                continue
-                            if metric_type and entry.get("metric_type") != metric_type:
-                                continue
+                for path in self._data_files(start_time, end_time):
+                    with open(path, "rb") as f:
+                        for line in f:
+                            try:
+                                entry = _loads(line)
+                                if entry.get("agent") != agent_name:
+                                    continue
+                                if metric_type and entry.get("metric_type") != metric_type:
+                                    continue
 
-                            entry_time = datetime.fromisoformat(entry.get("timestamp", ""))
-                            if start_time and entry_time < start_time:
-                                continue
-                            if end_time and entry_time > end_time:
-                                continue
+                                entry_time = datetime.fromisoformat(entry.get("timestamp", ""))
+                                if start_time and entry_time < start_time:
+                                    continue
+                                if end_time and entry_time > end_time:
+                                    continue
 
-                            results.append(entry)
-                        except (json.JSONDecodeError, ValueError):
-                            continue
+                                results.append(entry)
+                            except ValueError:
+                                continue
             except Exception as e:
                 logging.error(f"Failed to read metrics from log: {e}")
 
         return results
 
     def get_agents(self) -> List[str]:
-        """Get list of all known agents from log file."""
-        agents = set()
-        if not self.log_file.exists():
-            return []
+        """Get list of all known agents."""
+        return sorted(self._agents)
 
-        with self._lock:
-            try:
-                with open(self.log_file, "r") as f:
-                    for line in f:
-                        try:
-                            entry = json.loads(line.strip())
-                            if "agent" in entry:
-                                agents.add(entry["agent"])
-                        except json.JSONDecodeError:
-                            continue
-            except Exception as e:
-                logging.error(f"Failed to get agents from log: {e}")
+    def close(self):
+        """Stop the flusher, write out pending lines and close the file."""
+        self._closed = True
+        self._wake.set()
+        self._flusher.join(timeout=5)
+        self.flush()
+        with self._write_lock:
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+                self._fp_day = None
+        atexit.unregister(self.flush)
 
-        return sorted(list(agents))
 
-    def close(self):
-        """Close connections (no-op for file storage)."""
-        pass
+# The only insert statement MySQLStorage issues, built once
+_MYSQL_INSERT = """INSERT INTO metrics (agent_name, metric_type, value_num, value_text, metadata, timestamp)
+                   VALUES (%s, %s, %s, %s, %s, %s)"""
 
 
 class MySQLStorage(StorageBackend):
@@ -157,7 +395,9 @@ class MySQLStorage(StorageBackend):
 
     def __init__(self, host: str = "localhost", port: int = 3306,
                  user: str = "monitor", password: str = "changeme",
-                 database: str = "monitoring"):
+                 database: str = "monitoring", flush_interval: float = 0.05,
+                 batch_size: int = 1 << 10, pool_size: int = 16,
+                 max_attempts: int = 8):
         self.config = {
             "host": host,
             "port": port,
@@ -166,22 +406,60 @@ class MySQLStorage(StorageBackend):
             "database": database
         }
         self._connection = None
+        # Insert cursor kept open across batches by the writer
+        self._cursor = None
         self._lock = threading.Lock()
         self._connect()
 
+        # The writer owns self._connection (under self._lock); reads borrow
+        # autocommit connections from a pool so they run in parallel. DBUtils'
+        # PooledDB is used when installed, else a LIFO queue of idle connections.
+        import pymysql
+        self._pool_size = pool_size
+        self._pool = None
+        self._idle: "queue.LifoQueue" = queue.LifoQueue(maxsize=pool_size)
+        if PooledDB is not None:
+            self._pool = PooledDB(creator=pymysql, maxconnections=pool_size, blocking=True,
+                                  ping=1, **self._connect_args(autocommit=True))
+
+        # Rows are queued by producers and inserted by a background writer,
+        # one multi-row INSERT and one commit per batch
+        self._q: "queue.SimpleQueue[Tuple]" = queue.SimpleQueue()
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        # A batch whose insert failed is retried ahead of newer rows, with
+        # exponential backoff (1s, 2s, 4s, ...) so a short outage loses
+        # nothing, and dropped after max_attempts failures
+        self._retry: List[Tuple] = []
+        self._attempts = 0
+        self._max_attempts = max_attempts
+        self._retry_at = 0.0
+        self._closed = False
+        self._wake = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, name="mysql-storage-writer",
+                                        daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _connect_args(self, autocommit: bool) -> Dict[str, Any]:
+        """pymysql.connect keyword arguments for this database."""
+        import pymysql
+        return dict(
+            host=self.config["host"],
+            port=self.config["port"],
+            user=self.config["user"],
+            password=self.config["password"],
+            database=self.config["database"],
+            charset="utf8mb4",
+            cursorclass=pymysql.cursors.DictCursor,
+            autocommit=autocommit
+        )
+
     def _connect(self):
-        """Establish database connection."""
+        """Establish the writer's database connection."""
         try:
             import pymysql
-            self._connection = pymysql.connect(
-                host=self.config["host"],
-                port=self.config["port"],
-                user=self.config["user"],
-                password=self.config["password"],
-                database=self.config["database"],
-                charset="utf8mb4",
-                cursorclass=pymysql.cursors.DictCursor
-            )
+            self._connection = pymysql.connect(**self._connect_args(autocommit=False))
             logging.info("Connected to MySQL database")
         except ImportError:
             logging.error("pymysql not installed. Install with: pip install pymysql")
@@ -192,41 +470,123 @@ class MySQLStorage(StorageBackend):
 
     def save_metric(self, agent_name: str, metric_type: str, value: Any,
                     timestamp: Optional[datetime] = None, metadata: Optional[Dict] = None) -> bool:
-        """Save metric to MySQL database."""
+        """Queue a metric for the writer thread."""
+        self._q.put_nowait((
+            agent_name,
+            metric_type,
+            *_split_value(value),
+            json.dumps(metadata or {}),
+            timestamp or datetime.now()
+        ))
+        if self._q.qsize() >= self._batch_size:
+            self._wake.set()
+        return True
+
+    def save_metrics_bulk(self, rows: Iterable[Tuple[str, str, Any, Optional[datetime]]]) -> bool:
+        """Queue all rows for the writer thread."""
+        now = datetime.now()
+        for agent_name, metric_type, value, timestamp in rows:
+            self._q.put_nowait((agent_name, metric_type, *_split_value(value), "{}", timestamp or now))
+        if self._q.qsize() >= self._batch_size:
+            self._wake.set()
+        return True
+
+    def _write_loop(self):
+        """Insert queued rows every flush_interval, or sooner when a batch fills up."""
+        while not self._closed:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> bool:
+        """Insert every queued row with one executemany and a single commit.
+
+        Returns False while rows are still pending, i.e. a failed batch is
+        waiting out its retry backoff.
+        """
         with self._lock:
+            if self._retry and time.monotonic() < self._retry_at:
+                return False
+            batch = self._retry + _drain(self._q)
+            self._retry = []
+            if not batch:
+                return True
             try:
                 if self._connection is None:
                     self._connect()
+                if self._cursor is None:
+                    self._cursor = self._connection.cursor()
 
-                cursor = self._connection.cursor()
-                sql = """INSERT INTO metrics (agent_name, metric_type, value, metadata, timestamp)
-                         VALUES (%s, %s, %s, %s, %s)"""
-                cursor.execute(sql, (
-                    agent_name,
-                    metric_type,
-                    str(value),
-                    json.dumps(metadata or {}),
-                    timestamp or datetime.now()
-                ))
+                # pymysql rewrites this into multi-row INSERT ... VALUES statements
+                self._cursor.executemany(_MYSQL_INSERT, batch)
                 self._connection.commit()
-                cursor.close()
+                self._attempts = 0
                 return True
             except Exception as e:
-                logging.error(f"Failed to save metric to MySQL: {e}")
+                self._reset_connection()
+                self._attempts += 1
+                if self._attempts < self._max_attempts:
+                    self._retry = batch
+                    delay = 2 ** (self._attempts - 1)
+                    self._retry_at = time.monotonic() + delay
+                    logging.error(f"Failed to save {len(batch)} metrics to MySQL "
+                                  f"(attempt {self._attempts}/{self._max_attempts}), "
+                                  f"retrying in {delay}s: {e}")
+                else:
+                    self._attempts = 0
+                    logging.error(f"Failed to save {len(batch)} metrics to MySQL after "
+                                  f"{self._max_attempts} attempts, dropping them: {e}")
                 return False
 
+    @contextmanager
+    def _reader(self):
+        """Borrow a pooled autocommit connection for a read."""
+        if self._pool is not None:
+            conn = self._pool.connection()
+            try:
+                yield conn
+            finally:
+                conn.close()  # back to the pool
+            return
+
+        import pymysql
+        try:
+            conn = self._idle.get_nowait()
+            conn.ping(reconnect=True)
+        except queue.Empty:
+            conn = pymysql.connect(**self._connect_args(autocommit=True))
+        try:
+            yield conn
+        except Exception:
+            conn.close()
+            raise
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _reset_connection(self):
+        """Drop the connection after a failure so the next use reconnects; caller holds _lock."""
+        if self._connection is not None:
+            try:
+                self._connection.rollback()
+                self._connection.close()
+            except Exception:
+                pass
+        self._connection = None
+        self._cursor = None
+
     def get_metrics(self, agent_name: str, metric_type: Optional[str] = None,
                     start_time: Optional[datetime] = None,
                     end_time: Optional[datetime] = None) -> List[Dict]:
         """Retrieve metrics from MySQL database."""
+        self.flush()
         results = []
-        with self._lock:
-            try:
-                if self._connection is None:
-                    self._connect()
-
-                cursor = self._connection.cursor()
-                sql = "SELECT * FROM metrics WHERE agent_name = %s"
+        try:
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                sql = ("SELECT id, agent_name, metric_type, value_num, value_text, metadata, timestamp"
+                       " FROM metrics WHERE agent_name = %s")
                 params = [agent_name]
 
                 if metric_type:
@@ -246,40 +606,123 @@ class MySQLStorage(StorageBackend):
                 cursor.execute(sql, params)
                 results = cursor.fetchall()
                 cursor.close()
-            except Exception as e:
-                logging.error(f"Failed to get metrics from MySQL: {e}")
+            for row in results:
+                value_num, value_text = row.pop("value_num"), row.pop("value_text")
+                row["value"] = value_text if value_num is None else value_num
+        except Exception as e:
+            logging.error(f"Failed to get metrics from MySQL: {e}")
 
         return results
 
     def get_agents(self) -> List[str]:
         """Get list of all known agents from database."""
+        self.flush()
         agents = []
-        with self._lock:
-            try:
-                if self._connection is None:
-                    self._connect()
-
-                cursor = self._connection.cursor()
+        try:
+            with self._reader() as conn:
+                cursor = conn.cursor()
                 cursor.execute("SELECT DISTINCT agent_name FROM metrics ORDER BY agent_name")
                 agents = [row["agent_name"] for row in cursor.fetchall()]
                 cursor.close()
-            except Exception as e:
-                logging.error(f"Failed to get agents from MySQL: {e}")
+        except Exception as e:
+            logging.error(f"Failed to get agents from MySQL: {e}")
 
         return agents
 
     def close(self):
-        """Close database connection."""
+        """Stop the writer, insert pending rows and close the connection."""
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=5)
+        # One last attempt, even if a failed batch is backing off
+        self._retry_at = 0.0
+        self.flush()
         with self._lock:
+            pending = len(self._retry) + self._q.qsize()
+            if pending:
+                logging.error(f"Closing MySQL storage with {pending} unsaved metrics")
+            if self._cursor is not None:
+                self._cursor.close()
+                self._cursor = None
             if self._connection:
                 self._connection.close()
                 self._connection = None
+        if self._pool is not None:
+            self._pool.close()
+        for conn in _drain(self._idle):
+            conn.close()
+        atexit.unregister(self.flush)
+
+
+# Applied on every SQLite connection: WAL journal, fsync at checkpoints only,
+# 64 MiB page cache, in-memory temp tables and 256 MiB of memory-mapped I/O
+_SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA cache_size=-65536;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+"""
+
+# Numeric samples are stored natively in value_num (so AVG/MIN/MAX run in the
+# engine); anything else, such as JSON payloads, goes to value_text
+_SQLITE_TABLE = """
+    CREATE TABLE IF NOT EXISTS metrics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        agent_name TEXT NOT NULL,
+        metric_type TEXT NOT NULL,
+        value_num REAL,
+        value_text TEXT,
+        metadata TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+# One-shot upgrade of the old single `value TEXT` column: strings float()
+# accepts move to value_num, everything else to value_text
+_SQLITE_MIGRATE_VALUE = """
+    ALTER TABLE metrics RENAME TO metrics_old;
+    {table};
+    INSERT INTO metrics (id, agent_name, metric_type, value_num, value_text, metadata, timestamp)
+    SELECT id, agent_name, metric_type, as_real(value),
+           CASE WHEN as_real(value) IS NULL THEN value END,
+           metadata, timestamp
+    FROM metrics_old;
+    DROP TABLE metrics_old;
+""".format(table=_SQLITE_TABLE)
+
+# Newest-first index on the get_metrics filter columns, with value_num appended
+# so numeric queries that don't need metadata are answered from the index alone
+_SQLITE_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_agent_metric_time
+    ON metrics(agent_name, metric_type, timestamp DESC, value_num)
+"""
+
+# The only insert statement SQLiteStorage issues; one string object means one
+# entry in sqlite3's statement cache, compiled once per connection
+_SQLITE_INSERT = """INSERT INTO metrics (agent_name, metric_type, value_num, value_text, metadata, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?)"""
+
+# Columns get_metrics may select, and the SQL each one reads
+_SQLITE_COLUMNS = {
+    "id": "id",
+    "agent_name": "agent_name",
+    "metric_type": "metric_type",
+    "value": "COALESCE(value_num, value_text) AS value",
+    "value_num": "value_num",
+    "value_text": "value_text",
+    "metadata": "metadata",
+    "timestamp": "timestamp",
+}
+_SQLITE_DEFAULT_COLUMNS = ("id", "agent_name", "metric_type", "value", "metadata", "timestamp")
 
 
 class SQLiteStorage(StorageBackend):
     """SQLite database storage backend (fallback when MySQL unavailable)."""
 
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, flush_interval: float = 0.05,
+                 batch_size: int = 1 << 10, analyze_rows: int = 1 << 16,
+                 max_attempts: int = 5):
         # Use fallback path if /var/log is not writable
         if db_path is None:
             db_path = os.environ.get('MONITORING_DB_PATH')
@@ -306,63 +749,156 @@ class SQLiteStorage(StorageBackend):
             logging.warning(f"Using fallback database path: {self.db_path}")
         
         self._connection = None
+        self._cursor = None
         self._lock = threading.Lock()
         self._init_db()
 
+        # Rows are queued by producers and inserted by a background writer,
+        # one executemany and one commit per batch; producers only touch the
+        # SimpleQueue and never take self._lock
+        self._q: "queue.SimpleQueue[Tuple]" = queue.SimpleQueue()
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        # Rows inserted since the planner statistics were last refreshed
+        self._unanalyzed = 0
+        self._analyze_rows = analyze_rows
+        # A batch whose insert failed is retried ahead of newer rows, up to
+        # max_attempts flushes, before it is dropped
+        self._retry: List[Tuple] = []
+        self._attempts = 0
+        self._max_attempts = max_attempts
+        self._closed = False
+        self._wake = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, name="sqlite-storage-writer",
+                                        daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
     def _init_db(self):
         """Initialize SQLite database schema."""
         with self._lock:
-            self._connection = sqlite3.connect(str(self.db_path))
+            # Writes may come from the collector's storage thread; self._lock serializes use
+            # isolation_level=None: autocommit, writes open their own BEGIN/COMMIT
+            self._connection = sqlite3.connect(
+                str(self.db_path), check_same_thread=False, isolation_level=None
+            )
             self._connection.row_factory = sqlite3.Row
+            # WAL lets readers run alongside the writer, and synchronous=NORMAL
+            # fsyncs only at checkpoints instead of on every commit. Trade-off:
+            # a power loss can drop the last committed transactions, but the
+            # database itself is never corrupted.
+            self._connection.executescript(_SQLITE_PRAGMAS)
             cursor = self._connection.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    agent_name TEXT NOT NULL,
-                    metric_type TEXT NOT NULL,
-                    value TEXT NOT NULL,
-                    metadata TEXT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_agent_metric_time 
-                ON metrics(agent_name, metric_type, timestamp)
-            """)
-            self._connection.commit()
-            cursor.close()
+            cursor.execute(_SQLITE_TABLE)
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(metrics)")}
+            if "value" in columns:
+                logging.info("Migrating SQLite metrics table to value_num/value_text columns")
+                self._connection.create_function("as_real", 1, _as_real, deterministic=True)
+                self._connection.executescript(f"BEGIN; {_SQLITE_MIGRATE_VALUE} COMMIT;")
+            cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_agent_metric_time'"
+            )
+            row = cursor.fetchone()
+            if row is not None and "value_num" not in row[0]:
+                # Replace the index from older releases
+                cursor.execute("DROP INDEX idx_agent_metric_time")
+                row = None
+            cursor.execute(_SQLITE_INDEX)
+            if row is None:
+                cursor.execute("ANALYZE metrics")
+            # Kept open and reused by the writer for every batch
+            self._cursor = cursor
 
     def save_metric(self, agent_name: str, metric_type: str, value: Any,
                     timestamp: Optional[datetime] = None, metadata: Optional[Dict] = None) -> bool:
-        """Save metric to SQLite database."""
+        """Queue a metric for the writer thread."""
+        self._q.put_nowait((
+            agent_name,
+            metric_type,
+            *_split_value(value),
+            json.dumps(metadata or {}),
+            timestamp or datetime.now()
+        ))
+        if self._q.qsize() >= self._batch_size:
+            self._wake.set()
+        return True
+
+    def save_metrics_bulk(self, rows: Iterable[Tuple[str, str, Any, Optional[datetime]]]) -> bool:
+        """Queue all rows for the writer thread."""
+        now = datetime.now()
+        for agent_name, metric_type, value, timestamp in rows:
+            self._q.put_nowait((agent_name, metric_type, *_split_value(value), "{}", timestamp or now))
+        if self._q.qsize() >= self._batch_size:
+            self._wake.set()
+        return True
+
+    def _write_loop(self):
+        """Insert queued rows every flush_interval, or sooner when a batch fills up."""
+        while not self._closed:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> bool:
+        """Insert every queued row with one executemany and a single commit.
+
+        Returns False if rows are still pending: the connection is closed, or
+        the insert failed and the batch was kept for the next flush.
+        """
         with self._lock:
+            if self._connection is None:
+                return not (self._retry or self._q.qsize())
+            batch = self._retry + _drain(self._q)
+            self._retry = []
+            if not batch:
+                return True
             try:
-                cursor = self._connection.cursor()
-                sql = """INSERT INTO metrics (agent_name, metric_type, value, metadata, timestamp)
-                         VALUES (?, ?, ?, ?, ?)"""
-                cursor.execute(sql, (
-                    agent_name,
-                    metric_type,
-                    str(value),
-                    json.dumps(metadata or {}),
-                    timestamp or datetime.now()
-                ))
-                self._connection.commit()
-                cursor.close()
+                cursor = self._cursor
+                cursor.execute("BEGIN")
+                cursor.executemany(_SQLITE_INSERT, batch)
+                cursor.execute("COMMIT")
+                self._unanalyzed += len(batch)
+                if self._unanalyzed >= self._analyze_rows:
+                    # Keep index statistics in step with the data after bulk ingest
+                    cursor.execute("ANALYZE metrics")
+                    self._unanalyzed = 0
+                self._attempts = 0
                 return True
             except Exception as e:
-                logging.error(f"Failed to save metric to SQLite: {e}")
+                if self._connection.in_transaction:
+                    self._connection.execute("ROLLBACK")
+                self._attempts += 1
+                if self._attempts < self._max_attempts:
+                    self._retry = batch
+                    logging.error(f"Failed to save {len(batch)} metrics to SQLite "
+                                  f"(attempt {self._attempts}/{self._max_attempts}), will retry: {e}")
+                else:
+                    self._attempts = 0
+                    logging.error(f"Failed to save {len(batch)} metrics to SQLite after "
+                                  f"{self._max_attempts} attempts, dropping them: {e}")
                 return False
 
     def get_metrics(self, agent_name: str, metric_type: Optional[str] = None,
                     start_time: Optional[datetime] = None,
-                    end_time: Optional[datetime] = None) -> List[Dict]:
-        """Retrieve metrics from SQLite database."""
+                    end_time: Optional[datetime] = None,
+                    columns: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Retrieve metrics from SQLite database, newest first.
+
+        columns restricts the selected columns (default: id, agent_name,
+        metric_type, value, metadata and timestamp, where value is value_num or
+        value_text); selecting only timestamp and value_num lets SQLite answer
+        from idx_agent_metric_time alone.
+        """
+        columns = tuple(columns) if columns else _SQLITE_DEFAULT_COLUMNS
+        unknown = set(columns) - set(_SQLITE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown metric columns: {', '.join(sorted(unknown))}")
+        self.flush()
         results = []
         with self._lock:
             try:
                 cursor = self._connection.cursor()
-                sql = "SELECT * FROM metrics WHERE agent_name = ?"
+                sql = f"SELECT {', '.join(_SQLITE_COLUMNS[c] for c in columns)} FROM metrics WHERE agent_name = ?"
                 params = [agent_name]
 
                 if metric_type:
@@ -389,6 +925,7 @@ class SQLiteStorage(StorageBackend):
 
     def get_agents(self) -> List[str]:
         """Get list of all known agents from database."""
+        self.flush()
         agents = []
         with self._lock:
             try:
@@ -402,11 +939,339 @@ class SQLiteStorage(StorageBackend):
         return agents
 
     def close(self):
-        """Close database connection."""
+        """Stop the writer, insert pending rows and close the connection."""
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=5)
+        self.flush()
         with self._lock:
+            pending = len(self._retry) + self._q.qsize()
+            if pending:
+                logging.error(f"Closing SQLite storage with {pending} unsaved metrics")
             if self._connection:
+                self._cursor.close()
                 self._connection.close()
                 self._connection = None
+        atexit.unregister(self.flush)
+
+
+class _BitWriter:
+    """Append-only MSB-first bit stream."""
+    __slots__ = ("buf", "_acc", "_nbits")
+
+    def __init__(self):
+        self.buf = bytearray()
+        self._acc = 0
+        self._nbits = 0
+
+    def write(self, value: int, nbits: int):
+        self._acc = (self._acc << nbits) | value
+        self._nbits += nbits
+        while self._nbits >= 8:
+            self._nbits -= 8
+            self.buf.append((self._acc >> self._nbits) & 0xFF)
+        self._acc &= (1 << self._nbits) - 1
+
+    def getvalue(self) -> bytes:
+        """Bytes written so far, with the last partial byte zero-padded."""
+        if self._nbits:
+            return bytes(self.buf) + bytes([(self._acc << (8 - self._nbits)) & 0xFF])
+        return bytes(self.buf)
+
+    def __len__(self) -> int:
+        return len(self.buf) + (1 if self._nbits else 0)
+
+
+class _BitReader:
+    """MSB-first reader over a bit stream written by _BitWriter."""
+    __slots__ = ("_data", "_total", "_pos")
+
+    def __init__(self, data: bytes):
+        self._data = int.from_bytes(data, "big")
+        self._total = len(data) * 8
+        self._pos = 0
+
+    def read(self, nbits: int) -> int:
+        self._pos += nbits
+        return (self._data >> (self._total - self._pos)) & ((1 << nbits) - 1)
+
+
+def _put_varint(buf: bytearray, value: int):
+    """Append a signed integer as a zigzag LEB128 varint."""
+    value = (value << 1) ^ (value >> 63)
+    while value > 0x7F:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _iter_varints(data: bytes):
+    """Yield the signed integers of a zigzag LEB128 varint stream."""
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        yield (value >> 1) ^ -(value & 1)
+        value = shift = 0
+
+
+class _Chunk:
+    """Open chunk of one series: delta-of-delta timestamps + Gorilla XOR values.
+
+    Timestamps (integer microseconds) are stored as the first value, the
+    first delta, then zigzag LEB128 deltas-of-deltas, so regular sampling
+    costs about one byte per point. Values follow Gorilla: the first float's
+    64 bits, then the XOR with the previous value, written as a single 0 bit
+    when unchanged or as its meaningful bits inside a leading/trailing zero
+    window otherwise.
+    """
+    __slots__ = ("count", "min_ts", "max_ts", "ts", "vals",
+                 "_prev_ts", "_prev_delta", "_prev_bits", "_leading", "_trailing")
+
+    def __init__(self):
+        self.count = 0
+        self.min_ts = self.max_ts = 0
+        self.ts = bytearray()
+        self.vals = _BitWriter()
+        self._prev_ts = self._prev_delta = self._prev_bits = 0
+        self._leading = self._trailing = -1
+
+    def size(self) -> int:
+        return len(self.ts) + len(self.vals)
+
+    def append(self, ts: int, value: float):
+        bits = _BITS.unpack(_FLOAT.pack(value))[0]
+        if self.count == 0:
+            self.min_ts = ts
+            _put_varint(self.ts, ts)
+            self.vals.write(bits, 64)
+        else:
+            delta = ts - self._prev_ts
+            _put_varint(self.ts, delta if self.count == 1 else delta - self._prev_delta)
+            self._prev_delta = delta
+            self._append_value(bits)
+        self.min_ts = min(self.min_ts, ts)
+        self.max_ts = max(self.max_ts, ts) if self.count else ts
+        self._prev_ts = ts
+        self._prev_bits = bits
+        self.count += 1
+
+    def _append_value(self, bits: int):
+        xor = bits ^ self._prev_bits
+        if xor == 0:
+            self.vals.write(0, 1)
+            return
+        leading = min(64 - xor.bit_length(), 31)
+        trailing = (xor & -xor).bit_length() - 1
+        if self._leading >= 0 and leading >= self._leading and trailing >= self._trailing:
+            # Fits in the previous window: control bits 10
+            meaningful = 64 - self._leading - self._trailing
+            self.vals.write(0b10, 2)
+            self.vals.write(xor >> self._trailing, meaningful)
+        else:
+            # New window: control bits 11, 5 bits leading, 6 bits length (64 -> 0)
+            meaningful = 64 - leading - trailing
+            self.vals.write(0b11, 2)
+            self.vals.write(leading, 5)
+            self.vals.write(meaningful & 0x3F, 6)
+            self.vals.write(xor >> trailing, meaningful)
+            self._leading, self._trailing = leading, trailing
+
+    @staticmethod
+    def decode(count: int, ts_data: bytes, val_data: bytes) -> List[Tuple[int, float]]:
+        """Decode a chunk's (timestamp, value) points."""
+        points = []
+        varints = _iter_varints(ts_data)
+        reader = _BitReader(val_data)
+        ts = delta = bits = 0
+        leading = trailing = 0
+        for i in range(count):
+            if i == 0:
+                ts = next(varints)
+                bits = reader.read(64)
+            else:
+                step = next(varints)
+                delta = step if i == 1 else delta + step
+                ts += delta
+                if reader.read(1):
+                    if reader.read(1):
+                        leading = reader.read(5)
+                        meaningful = reader.read(6) or 64
+                        trailing = 64 - leading - meaningful
+                    bits ^= reader.read(64 - leading - trailing) << trailing
+            points.append((ts, _FLOAT.unpack(_BITS.pack(bits))[0]))
+        return points
+
+
+class ColumnarStorage(StorageBackend):
+    """Compressed columnar storage for numeric metrics.
+
+    Each (agent, metric_type) series is appended to its own
+    ``<agent>+<metric>.tsb`` file as sealed blocks of about block_size
+    bytes, each holding a delta-of-delta timestamp column and a Gorilla
+    XOR-encoded float column behind a (min_ts, max_ts, count) header. The
+    block headers are indexed in memory, so get_metrics skips every block
+    outside the requested time range without reading it. Open blocks are
+    also sealed every flush_interval seconds, bounding what a crash can
+    lose. Non-numeric values (JSON payloads) go to a LogStorage in the
+    ``text`` subdirectory.
+    """
+
+    _HEADER = struct.Struct("<qqIII")  # min_ts, max_ts, count, ts bytes, value bytes
+
+    def __init__(self, data_dir: str = None, block_size: int = 4096,
+                 flush_interval: float = 60.0):
+        if data_dir is None:
+            data_dir = os.environ.get('MONITORING_DATA_DIR', './data')
+        self.data_dir = Path(data_dir) / "columnar"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        # (agent, metric_type) -> open chunk / sealed block index
+        self._chunks: Dict[Tuple[str, str], _Chunk] = {}
+        self._index: Dict[Tuple[str, str], List[Tuple[int, int, int, int, int, int]]] = {}
+        for path in self.data_dir.glob("*.tsb"):
+            self._index[self._series_of(path)] = self._read_index(path)
+        self._text = LogStorage(str(self.data_dir / "text"))
+
+        self._flush_interval = flush_interval
+        self._closed = False
+        self._wake = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="columnar-storage-flush",
+                                         daemon=True)
+        self._flusher.start()
+        atexit.register(self.flush)
+
+    def _flush_loop(self):
+        """Seal open chunks every flush_interval."""
+        while not self._closed:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    @staticmethod
+    def _series_path_name(agent_name: str, metric_type: str) -> str:
+        return f"{quote(agent_name, safe='')}+{quote(metric_type, safe='')}.tsb"
+
+    @staticmethod
+    def _series_of(path: Path) -> Tuple[str, str]:
+        agent, _, metric = path.stem.partition("+")
+        return unquote(agent), unquote(metric)
+
+    def _read_index(self, path: Path) -> List[Tuple[int, int, int, int, int, int]]:
+        """Scan a series file's block headers: (min_ts, max_ts, offset, count, ts_len, val_len)."""
+        index = []
+        with open(path, "rb") as f:
+            while True:
+                header = f.read(self._HEADER.size)
+                if len(header) < self._HEADER.size:
+                    break
+                min_ts, max_ts, count, ts_len, val_len = self._HEADER.unpack(header)
+                index.append((min_ts, max_ts, f.tell(), count, ts_len, val_len))
+                f.seek(ts_len + val_len, os.SEEK_CUR)
+        return index
+
+    def _seal(self, series: Tuple[str, str], chunk: _Chunk):
+        """Append a chunk as a block to its series file and index it; caller holds _lock."""
+        vals = chunk.vals.getvalue()
+        path = self.data_dir / self._series_path_name(*series)
+        with open(path, "ab") as f:
+            f.write(self._HEADER.pack(chunk.min_ts, chunk.max_ts, chunk.count, len(chunk.ts), len(vals)))
+            offset = f.tell()
+            f.write(chunk.ts)
+            f.write(vals)
+        self._index.setdefault(series, []).append(
+            (chunk.min_ts, chunk.max_ts, offset, chunk.count, len(chunk.ts), len(vals))
+        )
+
+    def save_metric(self, agent_name: str, metric_type: str, value: Any,
+                    timestamp: Optional[datetime] = None, metadata: Optional[Dict] = None) -> bool:
+        """Append a numeric point to its series; other values go to the text log."""
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return self._text.save_metric(agent_name, metric_type, value, timestamp, metadata)
+        series = (agent_name, metric_type)
+        with self._lock:
+            try:
+                ts = ((timestamp or datetime.now()) - _EPOCH) // _MICROSECOND
+                chunk = self._chunks.get(series)
+                if chunk is None:
+                    chunk = self._chunks[series] = _Chunk()
+                chunk.append(ts, float(value))
+                if chunk.size() >= self.block_size:
+                    self._seal(series, chunk)
+                    del self._chunks[series]
+                return True
+            except Exception as e:
+                logging.error(f"Failed to save metric to columnar storage: {e}")
+                return False
+
+    def flush(self):
+        """Seal every open chunk to disk."""
+        with self._lock:
+            for series, chunk in list(self._chunks.items()):
+                try:
+                    self._seal(series, chunk)
+                except OSError as e:
+                    logging.error(f"Failed to flush columnar series {series}: {e}")
+                    continue
+                del self._chunks[series]
+        self._text.flush()
+
+    def get_metrics(self, agent_name: str, metric_type: Optional[str] = None,
+                    start_time: Optional[datetime] = None,
+                    end_time: Optional[datetime] = None) -> List[Dict]:
+        """Retrieve metrics, decoding only blocks that overlap the time range."""
+        lo = (start_time - _EPOCH) // _MICROSECOND if start_time else None
+        hi = (end_time - _EPOCH) // _MICROSECOND if end_time else None
+        results = []
+        with self._lock:
+            series_list = [s for s in set(self._index) | set(self._chunks)
+                           if s[0] == agent_name and (not metric_type or s[1] == metric_type)]
+            for series in series_list:
+                points = []
+                # Blocks are in arrival order, not time order (late samples,
+                # backfills, clock steps), so every block's range is checked
+                blocks = [block for block in self._index.get(series, [])
+                          if (lo is None or block[1] >= lo) and (hi is None or block[0] <= hi)]
+                if blocks:
+                    with open(self.data_dir / self._series_path_name(*series), "rb") as f:
+                        for min_ts, max_ts, offset, count, ts_len, val_len in blocks:
+                            f.seek(offset)
+                            ts_data = f.read(ts_len)
+                            points.extend(_Chunk.decode(count, ts_data, f.read(val_len)))
+                chunk = self._chunks.get(series)
+                if chunk is not None:
+                    points.extend(_Chunk.decode(chunk.count, bytes(chunk.ts), chunk.vals.getvalue()))
+                for ts, value in points:
+                    if (lo is not None and ts < lo) or (hi is not None and ts > hi):
+                        continue
+                    results.append({
+                        "timestamp": (_EPOCH + timedelta(microseconds=ts)).isoformat(),
+                        "agent": agent_name,
+                        "metric_type": series[1],
+                        "value": value,
+                        "metadata": {}
+                    })
+        results.extend(self._text.get_metrics(agent_name, metric_type, start_time, end_time))
+        results.sort(key=lambda entry: entry["timestamp"])
+        return results
+
+    def get_agents(self) -> List[str]:
+        """Get list of all known agents."""
+        with self._lock:
+            agents = {agent for agent, _ in self._index} | {agent for agent, _ in self._chunks}
+        return sorted(agents | set(self._text.get_agents()))
+
+    def close(self):
+        """Stop the flusher, seal open chunks and close the text log."""
+        self._closed = True
+        self._wake.set()
+        self._flusher.join(timeout=5)
+        self.flush()
+        self._text.close()
+        atexit.unregister(self.flush)
 
 
 def create_storage(backend: str = "log", **kwargs) -> StorageBackend:
@@ -415,5 +1280,7 @@ def create_storage(backend: str = "log", **kwargs) -> StorageBackend:
         return MySQLStorage(**kwargs)
     elif backend == "sqlite":
         return SQLiteStorage(**kwargs)
+    elif backend == "columnar":
+        return ColumnarStorage(**kwargs)
     else:
         return LogStorage(**kwargs)
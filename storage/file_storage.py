@@ -12,6 +12,18 @@ from datetime import datetime
 from typing import List, Dict, Any
 import threading
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_line(obj: Dict[str, Any]) -> bytes:
+    """Serialize one record as a newline-terminated JSON line"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(obj, default=str) + '\n').encode('utf-8')
+
 
 class FileStorage:
     """Storage implementation using rotating log files"""
@@ -62,6 +74,9 @@ class FileStorage:
             except:
                 self.json_file = './metrics_data.json'
         
+        # Append-only descriptor for the JSON Lines file, opened on first write
+        self._json_fd = None
+        
         # Thread safety
         self._lock = threading.Lock()
         
@@ -94,9 +109,9 @@ class FileStorage:
             for metrics in metrics_list:
                 # Format for human-readable log
                 self._store_human_readable(metrics)
-                
-                # Store in JSON format
-                self._store_json(metrics)
+            
+            # Store in JSON format
+            self._store_json(metrics_list)
     
     def _store_human_readable(self, metrics: Dict[str, Any]):
         """Store metrics in human-readable format"""
@@ -150,13 +165,22 @@ class FileStorage:
         for line in lines:
             self.logger.info(line)
     
-    def _store_json(self, metrics: Dict[str, Any]):
-        """Store metrics in JSON format for machine parsing"""
+    def _store_json(self, metrics_list: List[Dict[str, Any]]):
+        """Append metrics in JSON Lines format for machine parsing"""
+        if not metrics_list:
+            return
         try:
-            with open(self.json_file, 'a') as f:
-                # Write each metric as a separate JSON line (JSON Lines format)
-                json_line = json.dumps(metrics, default=str)
-                f.write(json_line + '\n')
+            if self._json_fd is None:
+                self._json_fd = os.open(
+                    self.json_file,
+                    os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, 'O_CLOEXEC', 0),
+                    0o644
+                )
+            # One write for the whole batch
+            data = memoryview(b''.join(_dumps_line(metrics) for metrics in metrics_list))
+            while data:
+                written = os.write(self._json_fd, data)
+                data = data[written:]
         except Exception as e:
             self.logger.error(f"Error writing JSON: {e}")
     
@@ -194,6 +218,11 @@ class FileStorage:
     
     def close(self):
         """Close storage and cleanup"""
+        with self._lock:
+            if self._json_fd is not None:
+                os.close(self._json_fd)
+                self._json_fd = None
+        
         if hasattr(self, 'handler'):
             self.handler.close()
             self.logger.removeHandler(self.handler)
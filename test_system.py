@@ -119,6 +119,108 @@ def test_storage():
         return False
 
 
+def test_columnar_storage():
+    """Test the columnar backend's compressed block format"""
+    print("\n" + "=" * 50)
+    print("Testing Columnar Storage")
+    print("=" * 50)
+    
+    try:
+        import math
+        import random
+        import struct
+        import tempfile
+        from datetime import datetime, timedelta
+        sys.path.insert(0, str(Path(__file__).parent / "src"))
+        from monitoring import storage as monitoring_storage
+        from monitoring.storage import ColumnarStorage
+        
+        def bits(value):
+            # Compare floats bit for bit so NaN and -0.0 count too
+            return struct.pack("<d", value)
+        
+        data_dir = tempfile.mkdtemp()
+        t0 = datetime(2024, 1, 1, 12, 0, 0, 250000)
+        
+        # Random values mixed with repeats and special floats, irregular spacing
+        specials = [math.nan, 0.0, -0.0, math.inf, -math.inf, 5e-324, 1.7976931348623157e308]
+        values = []
+        timestamps = []
+        ts = t0
+        for i in range(3000):
+            roll = random.random()
+            if roll < 0.2:
+                value = random.choice(specials)
+            elif roll < 0.4 and values:
+                value = values[-1]
+            elif roll < 0.6:
+                value = float(random.randint(-1000, 1000))
+            else:
+                value = random.uniform(-1e6, 1e6)
+            ts += timedelta(microseconds=random.choice([5000000, 5000000, 4999999, 17, 3600000000]))
+            values.append(value)
+            timestamps.append(ts)
+        
+        print("\n1. Testing encode/decode round trip...")
+        store = ColumnarStorage(data_dir, block_size=256)
+        for ts, value in zip(timestamps, values):
+            assert store.save_metric("test-agent", "cpu_usage", value, ts)
+        results = store.get_metrics("test-agent", "cpu_usage")
+        assert [bits(r["value"]) for r in results] == [bits(v) for v in values]
+        assert [r["timestamp"] for r in results] == [ts.isoformat() for ts in timestamps]
+        print(f"   ✓ {len(results)} points round-tripped, including NaN/±0.0/±inf")
+        store.close()
+        
+        print("\n2. Testing reopen from disk...")
+        store = ColumnarStorage(data_dir, block_size=256)
+        results = store.get_metrics("test-agent", "cpu_usage")
+        assert [bits(r["value"]) for r in results] == [bits(v) for v in values]
+        assert store.get_agents() == ["test-agent"]
+        print(f"   ✓ Re-read {len(results)} points from "
+              f"{len(store._index[('test-agent', 'cpu_usage')])} sealed blocks")
+        
+        print("\n3. Testing range pruning...")
+        start, end = timestamps[1000], timestamps[1100]
+        decoded = []
+        decode = monitoring_storage._Chunk.decode
+        monitoring_storage._Chunk.decode = staticmethod(
+            lambda count, ts_data, val_data: decoded.append(count) or decode(count, ts_data, val_data)
+        )
+        try:
+            results = store.get_metrics("test-agent", "cpu_usage", start, end)
+        finally:
+            monitoring_storage._Chunk.decode = staticmethod(decode)
+        expected = [bits(v) for ts, v in zip(timestamps, values) if start <= ts <= end]
+        assert [bits(r["value"]) for r in results] == expected
+        assert sum(decoded) < len(values) // 4
+        print(f"   ✓ {len(results)} points from {len(decoded)} decoded blocks")
+        store.close()
+        
+        print("\n4. Testing out-of-order blocks...")
+        store = ColumnarStorage(tempfile.mkdtemp(), block_size=64)
+        day = timedelta(days=1)
+        for base, value in ((t0 + 2 * day, 1.0), (t0, 2.0), (t0 + 3 * day, 3.0)):
+            for i in range(40):
+                store.save_metric("test-agent", "cpu_usage", value, base + timedelta(seconds=i))
+            store.flush()
+        results = store.get_metrics("test-agent", "cpu_usage",
+                                    t0 - timedelta(hours=1), t0 + timedelta(hours=1))
+        assert {r["value"] for r in results} == {2.0} and len(results) == 40
+        results = store.get_metrics("test-agent", "cpu_usage")
+        assert [r["timestamp"] for r in results] == sorted(r["timestamp"] for r in results)
+        print("   ✓ Late block found by range query")
+        store.close()
+        
+        print("\n✅ Columnar storage test PASSED")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Columnar storage test FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def test_visualization():
     """Test visualization functionality"""
     print("\n" + "=" * 50)
@@ -222,6 +324,328 @@ def test_xmlrpc_server():
         return False
 
 
+def test_sqlite_migration():
+    """Test the upgrade of the old single-column SQLite metrics table"""
+    print("\n" + "=" * 50)
+    print("Testing SQLite Migration")
+    print("=" * 50)
+
+    try:
+        import sqlite3
+        import tempfile
+        sys.path.insert(0, str(Path(__file__).parent / "src"))
+        from monitoring.storage import SQLiteStorage
+
+        # Table and rows as written by releases with a single `value TEXT` column
+        db_path = str(Path(tempfile.mkdtemp()) / "metrics.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE metrics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                agent_name TEXT NOT NULL,
+                metric_type TEXT NOT NULL,
+                value TEXT,
+                metadata TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("CREATE INDEX idx_agent_metric_time ON metrics(agent_name, metric_type, timestamp)")
+        old_rows = [
+            ("cpu_usage", "42.5", "2024-01-01 12:00:00"),
+            ("cpu_temperature", "7", "2024-01-01 12:00:01"),
+            ("system_load", '{"1min": 0.5}', "2024-01-01 12:00:02"),
+            ("security_threats", "abc", "2024-01-01 12:00:03"),
+        ]
+        conn.executemany(
+            "INSERT INTO metrics (agent_name, metric_type, value, metadata, timestamp) VALUES ('test-agent', ?, ?, '{}', ?)",
+            old_rows
+        )
+        conn.commit()
+        conn.close()
+
+        print("\n1. Testing column split...")
+        store = SQLiteStorage(db_path)
+        results = store.get_metrics("test-agent", columns=("metric_type", "value_num", "value_text"))
+        split = {r["metric_type"]: (r["value_num"], r["value_text"]) for r in results}
+        assert split == {
+            "cpu_usage": (42.5, None),
+            "cpu_temperature": (7.0, None),
+            "system_load": (None, '{"1min": 0.5}'),
+            "security_threats": (None, "abc"),
+        }, split
+        print(f"   ✓ {len(results)} rows moved to value_num/value_text")
+
+        print("\n2. Testing migrated table...")
+        columns = {row[1] for row in store._connection.execute("PRAGMA table_info(metrics)")}
+        assert "value" not in columns and {"value_num", "value_text"} <= columns
+        index_sql = store._connection.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'idx_agent_metric_time'"
+        ).fetchone()[0]
+        assert "value_num" in index_sql
+        store.save_metric("test-agent", "cpu_usage", 55.0)
+        assert len(store.get_metrics("test-agent", "cpu_usage")) == 2
+        print("   ✓ Old column and index replaced, new rows insert")
+        store.close()
+
+        print("\n3. Testing reopen...")
+        store = SQLiteStorage(db_path)
+        assert len(store.get_metrics("test-agent")) == len(old_rows) + 1
+        print("   ✓ Reopened without migrating again")
+        store.close()
+
+        print("\n✅ SQLite migration test PASSED")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ SQLite migration test FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_rpc_encodings():
+    """Test the JSON-RPC/msgpack endpoints and the connection limit of both agents"""
+    print("\n" + "=" * 50)
+    print("Testing Agent RPC Endpoints")
+    print("=" * 50)
+
+    try:
+        import http.client
+        import socket
+        import threading
+        sys.path.insert(0, str(Path(__file__).parent / "src"))
+        from monitoring import agent as monitoring_agent
+        from agent import agent_server
+
+        def rpc(port, body, content_type):
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("POST", "/RPC2", body, {"Content-Type": content_type})
+            response = conn.getresponse()
+            data = response.read()
+            conn.close()
+            return response.status, data
+
+        def start_servers(limit):
+            servers = [
+                ("monitoring.agent", monitoring_agent.ThreadedXMLRPCServer(
+                    ("127.0.0.1", 0), max_workers=limit, allow_none=True, logRequests=False
+                )),
+                ("agent_server", agent_server.ThreadedXMLRPCServer(
+                    ("127.0.0.1", 0), requestHandler=agent_server.AgentRequestHandler,
+                    max_connections=limit, allow_none=True, logRequests=False
+                )),
+            ]
+            for _, server in servers:
+                server.register_function(lambda: "pong", "ping")
+                server.register_function(lambda x, y: x + y, "add")
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+            return servers
+
+        def stop_servers(servers):
+            for _, server in servers:
+                server.shutdown()
+                server.server_close()
+
+        servers = start_servers(16)
+        try:
+            print("\n1. Testing JSON-RPC...")
+            for label, server in servers:
+                port = server.server_address[1]
+                status, data = rpc(port, json.dumps(
+                    {"jsonrpc": "2.0", "method": "add", "params": [2, 3], "id": 1}
+                ), "application/json")
+                assert status == 200 and json.loads(data) == {"jsonrpc": "2.0", "result": 5, "id": 1}
+                status, data = rpc(port, json.dumps(
+                    {"jsonrpc": "2.0", "method": "missing", "params": [], "id": 2}
+                ), "application/json")
+                reply = json.loads(data)
+                assert status == 200 and reply["error"]["code"] == -32000 and reply["id"] == 2
+                status, _ = rpc(port, b"{not json", "application/json")
+                assert status == 500
+                print(f"   ✓ {label}: result, error and malformed request handled")
+
+            print("\n2. Testing msgpack-RPC...")
+            msgpack = monitoring_agent.msgpack
+            if msgpack is None:
+                print("   - msgpack not installed, skipped")
+            else:
+                port = servers[0][1].server_address[1]
+                status, data = rpc(port, msgpack.packb(
+                    {"jsonrpc": "2.0", "method": "add", "params": [2, 3], "id": 1}
+                ), "application/msgpack")
+                assert status == 200 and msgpack.unpackb(data, raw=False)["result"] == 5
+                print("   ✓ monitoring.agent: msgpack call answered")
+        finally:
+            stop_servers(servers)
+
+        print("\n3. Testing connection limit...")
+        servers = start_servers(1)
+        try:
+            for label, server in servers:
+                # The first connection holds the only slot; the second is turned away
+                port = server.server_address[1]
+                held = socket.create_connection(("127.0.0.1", port), timeout=5)
+                time.sleep(0.2)
+                rejected = socket.create_connection(("127.0.0.1", port), timeout=5)
+                status_line = rejected.makefile("rb").readline()
+                rejected.close()
+                assert status_line.startswith(b"HTTP/1.1 503"), status_line
+                # Closing the held connection frees the slot again
+                held.close()
+                time.sleep(0.2)
+                proxy = xmlrpc.client.ServerProxy(f"http://127.0.0.1:{port}/", allow_none=True)
+                assert proxy.ping() == "pong"
+                print(f"   ✓ {label}: connection over the limit answered 503")
+        finally:
+            stop_servers(servers)
+
+        print("\n✅ Agent RPC test PASSED")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Agent RPC test FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_failed_login_count():
+    """Test incremental failed-login counting across read chunk boundaries"""
+    print("\n" + "=" * 50)
+    print("Testing Failed Login Counting")
+    print("=" * 50)
+
+    try:
+        import tempfile
+        sys.path.insert(0, str(Path(__file__).parent / "src"))
+        from monitoring import agent as monitoring_agent
+
+        collector = monitoring_agent.MetricsCollector(max_requests=1)
+        log_path = str(Path(tempfile.mkdtemp()) / "auth.log")
+
+        # Uneven line lengths so markers land across every chunk offset
+        lines = []
+        expected = 0
+        for i in range(200):
+            if i % 3 == 0:
+                lines.append(f"sshd[{i}]: Failed password for root from 10.0.0.{i % 256}{' ' * (i % 11)}\n")
+                expected += 1
+            elif i % 3 == 1:
+                lines.append(f"sudo: pam_unix(sudo:auth): authentication failure; uid={i}\n")
+                expected += 1
+            else:
+                lines.append(f"sshd[{i}]: Accepted publickey for user{' ' * (i % 7)}\n")
+
+        chunk_size = monitoring_agent.AUTH_LOG_READ_CHUNK
+        monitoring_agent.AUTH_LOG_READ_CHUNK = 7
+        try:
+            with collector._threats_lock:
+                print("\n1. Testing split markers...")
+                with open(log_path, "w") as f:
+                    f.writelines(lines)
+                counted = collector._count_new_failed_logins(log_path)
+                assert counted == expected, (counted, expected)
+                print(f"   ✓ Counted {counted} failed logins read 7 bytes at a time")
+
+                print("\n2. Testing incremental reads...")
+                assert collector._count_new_failed_logins(log_path) == 0
+                with open(log_path, "a") as f:
+                    f.write("sshd[1]: Failed pass")
+                assert collector._count_new_failed_logins(log_path) == 0
+                with open(log_path, "a") as f:
+                    f.write("word for root\nsshd[2]: Failed password for root\n")
+                assert collector._count_new_failed_logins(log_path) == 1
+                print("   ✓ Only appended lines counted")
+        finally:
+            monitoring_agent.AUTH_LOG_READ_CHUNK = chunk_size
+            collector._pool.shutdown(wait=False)
+
+        print("\n✅ Failed login count test PASSED")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Failed login count test FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_collector_polling():
+    """Test endpoint deduplication and the failed-agent backoff schedule"""
+    print("\n" + "=" * 50)
+    print("Testing Collector Polling")
+    print("=" * 50)
+
+    try:
+        import socket
+        import tempfile
+        import threading
+        from xmlrpc.server import SimpleXMLRPCServer
+        sys.path.insert(0, str(Path(__file__).parent / "src"))
+        from monitoring.collector import AgentConnection, Collector
+
+        calls = []
+        server = SimpleXMLRPCServer(("127.0.0.1", 0), allow_none=True, logRequests=False)
+        server.register_function(lambda: calls.append(1) or {"cpu_usage": 50.0}, "get_metrics")
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+
+        # A port nothing listens on
+        probe = socket.socket()
+        probe.bind(("127.0.0.1", 0))
+        dead_port = probe.getsockname()[1]
+        probe.close()
+
+        config_dir = Path(tempfile.mkdtemp())
+        config_path = config_dir / "config.ini"
+        config_path.write_text(
+            "[general]\npoll_interval = 10\n"
+            "[storage]\nbackend = log\n"
+            f"[logging]\nlog_file = {config_dir / 'collector.log'}\n"
+            f"[agents]\nweb = 127.0.0.1:{port}\nweb-alias = 127.0.0.1:{port}\n"
+            f"down = 127.0.0.1:{dead_port}\n"
+        )
+        collector = Collector(str(config_path))
+
+        try:
+            print("\n1. Testing endpoint deduplication...")
+            metrics_list, _ = collector.poll_all_agents()
+            assert sorted(m["_agent_name"] for m in metrics_list) == ["web", "web-alias"]
+            assert len(calls) == 1
+            print(f"   ✓ {len(metrics_list)} agents at one endpoint polled with {len(calls)} call")
+
+            print("\n2. Testing failed agent backoff...")
+            down = collector.agents["down"]
+            assert down._failure_count == 1 and down._backing_off()
+            collector.poll_all_agents()
+            assert down._failure_count == 1
+            print("   ✓ Failed agent skipped while backing off")
+        finally:
+            collector.stop()
+            server.shutdown()
+            server.server_close()
+
+        print("\n3. Testing backoff schedule...")
+        agent = AgentConnection("test-agent", "127.0.0.1", dead_port)
+        delays = []
+        for _ in range(12):
+            agent._record_failure()
+            delays.append(round(agent._next_retry - time.monotonic()))
+        assert delays == [2, 4, 8, 16, 32, 64, 128, 256, 300, 300, 300, 300], delays
+        agent._record_success()
+        assert agent._failure_count == 0 and not agent._backing_off()
+        print(f"   ✓ Delays {delays[:9]}..., reset on success")
+
+        print("\n✅ Collector polling test PASSED")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Collector polling test FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def main():
     """Run all tests"""
     print("=" * 60)
@@ -231,8 +655,13 @@ def main():
     tests = [
         ("Agent Server", test_agent),
         ("Storage Layer", test_storage),
+        ("Columnar Storage", test_columnar_storage),
+        ("SQLite Migration", test_sqlite_migration),
         ("Visualization", test_visualization),
-        ("XML-RPC Server", test_xmlrpc_server)
+        ("XML-RPC Server", test_xmlrpc_server),
+        ("Agent RPC Endpoints", test_rpc_encodings),
+        ("Failed Login Counting", test_failed_login_count),
+        ("Collector Polling", test_collector_polling)
     ]
     
     results = []